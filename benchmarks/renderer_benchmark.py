@@ -0,0 +1,120 @@
+"""
+Compare DRF's JSONRenderer with ORJSONRenderer on payloads shaped like our responses.
+
+    python benchmarks/renderer_benchmark.py [--number 200]
+"""
+import os
+import sys
+import json
+import uuid
+import timeit
+import argparse
+from decimal import Decimal
+from datetime import date, time, timedelta
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if not settings.configured:
+    settings.configure(USE_TZ=True, TIME_ZONE="Asia/Ho_Chi_Minh", INSTALLED_APPS=["rest_framework"])
+    django.setup()
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from vticket_app.utils.orjson_renderer import ORJSONRenderer
+
+def envelope(data):
+    return {"data": data, "status": 1, "message": "Thành công"}
+
+def event(event_id: int, ticket_types: int = 0, seats: int = 0) -> dict:
+    return {
+        "id": event_id,
+        "name": f"Đêm nhạc số {event_id}",
+        "description": "Mô tả sự kiện " * 40,
+        "start_date": date(2026, 12, 1) + timedelta(days=event_id % 30),
+        "end_date": date(2026, 12, 2) + timedelta(days=event_id % 30),
+        "start_time": time(19, 30),
+        "location": "Nhà hát lớn Hà Nội",
+        "banner_url": f"https://example.com/banners/{event_id}.png",
+        "created_at": timezone.now(),
+        "event_topic": [1, 2, 3],
+        "total_seats": ticket_types*seats,
+        "sold_seats": ticket_types*seats//3,
+        "available_seats": ticket_types*seats - ticket_types*seats//3,
+        "ticket_types": [
+            {
+                "id": event_id*100 + ticket_type_id,
+                "name": f"Hạng {ticket_type_id}",
+                "description": "Ghế ngồi khu vực trung tâm",
+                "price": 500000 + ticket_type_id*100000,
+                "ticket_type_details": [
+                    {"id": ticket_type_id, "fee_name": "VAT", "fee_type": "percent", "fee_value": 10}
+                ],
+                "seat_configurations": [
+                    {"id": ticket_type_id*seats + seat, "position": "A", "seat_number": seat, "is_not_available": seat % 3 == 0}
+                    for seat in range(seats)
+                ]
+            }
+            for ticket_type_id in range(ticket_types)
+        ]
+    }
+
+def payloads() -> dict:
+    today = date.today()
+
+    return {
+        "event detail (5 ticket types x 400 seats)": envelope({
+            "event": event(1, ticket_types=5, seats=400),
+            "related_events": [event(event_id) for event_id in range(2, 10)],
+            "org_info": {"id": 7, "first_name": "Vticket", "last_name": "Org", "avatar_url": None}
+        }),
+        "search page (20 events)": envelope({
+            "next": "eyJ2IjogWyIyMDI2LTEyLTAxIiwgMjBdLCAiciI6IGZhbHNlfQ==",
+            "previous": None,
+            "page_size": 20,
+            "total_items": 1200,
+            "data": [event(event_id) for event_id in range(20)]
+        }),
+        "statistic (365 days)": envelope({
+            "statistic_by_day": [
+                {"date": today - timedelta(days=day), "ticket_sold": day*3, "revenue": Decimal(day*1500000)}
+                for day in range(365)
+            ],
+            "total_ticket_sold": 199290,
+            "total_revenue": Decimal("99645000000")
+        }),
+        "gate tickets (5000 tickets)": envelope([
+            {"id": ticket, "uuid": uuid.uuid4(), "paid_at": timezone.now(), "paid_amount": 550000}
+            for ticket in range(5000)
+        ])
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    renderers = {"JSONRenderer": JSONRenderer(), "ORJSONRenderer": ORJSONRenderer()}
+
+    print(f"{'payload':<45}{'size':>10}" + "".join(f"{name:>18}" for name in renderers) + f"{'speedup':>10}")
+
+    for name, payload in payloads().items():
+        rendered = {renderer_name: renderer.render(payload) for renderer_name, renderer in renderers.items()}
+        assert json.loads(rendered["JSONRenderer"]) == json.loads(rendered["ORJSONRenderer"]), name
+        size = len(rendered["JSONRenderer"])
+        timings = {
+            renderer_name: min(timeit.repeat(lambda: renderer.render(payload), number=args.number, repeat=3))/args.number*1000
+            for renderer_name, renderer in renderers.items()
+        }
+
+        print(
+            f"{name:<45}{size:>10}"
+            + "".join(f"{timings[renderer_name]:>15.3f} ms" for renderer_name in renderers)
+            + f"{timings['JSONRenderer']/timings['ORJSONRenderer']:>9.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
@@ -0,0 +1,17 @@
+CREATE MATERIALIZED VIEW IF NOT EXISTS hourly_ticket_type_sales AS
+SELECT
+    ROW_NUMBER() OVER (ORDER BY tt.event_id, tt.id, date_trunc('hour', ut.paid_at)) AS id,
+    tt.event_id AS event_id,
+    tt.id AS ticket_type_id,
+    date_trunc('hour', ut.paid_at) AS hour,
+    COUNT(ut.id) AS tickets,
+    COALESCE(SUM(ut.paid_amount), 0) AS revenue
+FROM user_ticket ut
+JOIN seat_configuration sc ON sc.id = ut.seat_id
+JOIN ticket_type tt ON tt.id = sc.ticket_type_id
+WHERE ut.is_refunded = FALSE AND ut.paid_at IS NOT NULL
+GROUP BY tt.event_id, tt.id, date_trunc('hour', ut.paid_at);
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS hourly_ticket_type_sales_bucket_idx ON hourly_ticket_type_sales (event_id, ticket_type_id, hour);
+CREATE INDEX IF NOT EXISTS hourly_ticket_type_sales_event_hour_idx ON hourly_ticket_type_sales (event_id, hour);
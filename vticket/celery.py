@@ -14,4 +14,8 @@ app.conf.task_default_queue = 'event_task_queue'
 
 @app.on_after_configure.connect
 def setup_periodic_tasks(sender, **kwargs):
-    sender.add_periodic_task(30.0, keep_celery_alive.s())
\ No newline at end of file
+    sender.add_periodic_task(30.0, keep_celery_alive.s())
+    sender.add_periodic_task(300.0, sender.signature("vticket_app.tasks.statistic_tasks.refresh_hourly_ticket_type_sales"))
+    sender.add_periodic_task(600.0, sender.signature("vticket_app.tasks.statistic_tasks.reconcile_event_leaderboard"))
+    sender.add_periodic_task(60.0, sender.signature("vticket_app.tasks.init_page_tasks.refresh_home_page"))
+    sender.add_periodic_task(3600.0, sender.signature("vticket_app.tasks.event_tasks.recompute_related_events"))
\ No newline at end of file
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'drf_yasg',
     'vticket_app',
     'corsheaders',
@@ -147,6 +148,10 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         'vticket_app.middlewares.custom_jwt_authentication.CustomJWTAuthentication',
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        'vticket_app.utils.orjson_renderer.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     "EXCEPTION_HANDLER": "vticket_app.middlewares.custom_exception_handler.custom_exception_handler"
 }
 
@@ -182,7 +187,7 @@ CELERY_TIMEZONE = "Asia/Ho_Chi_Minh"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
-CELERY_IMPORTS = ["vticket_app.tasks.queue_tasks", "vticket.core.tasks.keep_alive"]
+CELERY_IMPORTS = ["vticket_app.tasks.queue_tasks", "vticket_app.tasks.statistic_tasks", "vticket_app.tasks.init_page_tasks", "vticket_app.tasks.event_tasks", "vticket.core.tasks.keep_alive"]
 
 # AMQP
 AMQP_URL = config("AMQP_URL", None)
\ No newline at end of file
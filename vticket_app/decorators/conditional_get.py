@@ -0,0 +1,35 @@
+import json
+import hashlib
+from functools import wraps
+from rest_framework.response import Response
+
+from vticket_app.enums.rest_response_status_enum import RestResponseStatusEnum
+
+def conditional_get(etag_parts):
+    """
+    Strong ETag built from the version counters returned by `etag_parts(self, request, **kwargs)`
+    and the request path. A matching `If-None-Match` is answered with 304 before the view runs.
+    """
+    def callback_handler(callback):
+        @wraps(callback)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                parts = [request.get_full_path(), *etag_parts(self, request, *args, **kwargs)]
+                etag = f'"{hashlib.md5(json.dumps(parts, default=str).encode()).hexdigest()}"'
+            except Exception as e:
+                print(e)
+                return callback(self, request, *args, **kwargs)
+
+            if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+                response = Response(status=304)
+                response["ETag"] = etag
+                return response
+
+            response = callback(self, request, *args, **kwargs)
+
+            if isinstance(getattr(response, "data", None), dict) and response.data.get("status") == RestResponseStatusEnum.SUCCESS.value[0]:
+                response["ETag"] = etag
+
+            return response
+        return wrapper
+    return callback_handler
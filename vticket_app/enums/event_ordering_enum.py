@@ -0,0 +1,5 @@
+from django.db.models import TextChoices
+
+class EventOrderingEnum(TextChoices):
+    popularity = "popularity"
+    availability = "availability"
@@ -0,0 +1,5 @@
+from django.db.models import TextChoices
+
+class ExportFormatEnum(TextChoices):
+    csv = "csv"
+    ndjson = "ndjson"
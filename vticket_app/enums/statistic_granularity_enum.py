@@ -0,0 +1,6 @@
+from django.db.models import TextChoices
+
+class StatisticGranularityEnum(TextChoices):
+    day = "day"
+    week = "week"
+    month = "month"
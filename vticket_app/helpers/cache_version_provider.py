@@ -0,0 +1,18 @@
+from typing import Any
+from django.core.cache import cache
+
+class CacheVersionProvider():
+    __prefix_key = "version"
+
+    def __key(self, namespace: str, key: Any = None) -> str:
+        return f"{self.__prefix_key}:{namespace}" if key is None else f"{self.__prefix_key}:{namespace}:{key}"
+
+    def get(self, namespace: str, key: Any = None) -> int:
+        _key = self.__key(namespace, key)
+        cache.add(_key, 1, None)
+        return cache.get(_key) or 1
+
+    def bump(self, namespace: str, key: Any = None) -> int:
+        _key = self.__key(namespace, key)
+        cache.add(_key, 1, None)
+        return cache.incr(_key)
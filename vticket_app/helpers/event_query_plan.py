@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet
+
+from vticket_app.models.ticket_type import TicketType
+from vticket_app.models.user_ticket import UserTicket
+from vticket_app.models.seat_configuration import SeatConfiguration
+
+class EventQueryPlan():
+    """
+    Prefetch plans matching the `fields`/`exclude` kwargs given to `EventSerializer`, so that
+    serialising events runs a fixed number of queries whatever the number of ticket types and seats.
+    """
+
+    @staticmethod
+    def seat_queryset() -> QuerySet:
+        return SeatConfiguration.objects.annotate(
+            is_sold=Exists(UserTicket.objects.filter(seat=OuterRef("pk"), is_refunded=False))
+        ).order_by("id")
+
+    @staticmethod
+    def ticket_type_queryset(seat_availability: bool = True) -> QuerySet:
+        seats = EventQueryPlan.seat_queryset() if seat_availability else SeatConfiguration.objects.order_by("id")
+
+        return TicketType.objects.prefetch_related(
+            "ticket_type_details",
+            Prefetch("seat_configurations", queryset=seats)
+        )
+
+    @staticmethod
+    def apply(queryset: QuerySet, fields: list[str] = None, exclude: list[str] = None, seat_availability: bool = True) -> QuerySet:
+        def wanted(field: str) -> bool:
+            return field not in (exclude or []) and (not fields or field in fields)
+
+        queryset = queryset.defer("search_vector")
+
+        if wanted("event_topic"):
+            queryset = queryset.prefetch_related("event_topic")
+
+        if wanted("ticket_types"):
+            queryset = queryset.prefetch_related(
+                Prefetch("ticket_types", queryset=EventQueryPlan.ticket_type_queryset(seat_availability))
+            )
+
+        return queryset
+
+    @staticmethod
+    def held_seat_ids() -> set[int]:
+        """Seats currently held by a booking, read with a single key lookup for the whole payload."""
+        return {int(key.split(":")[-1]) for key in cache.keys("booking:*:seat:*")}
+
+    @staticmethod
+    def unavailable_seat_ids(event_id: int) -> set[int]:
+        """Seats of the event that are sold or currently held."""
+        sold = UserTicket.objects.filter(seat__ticket_type__event_id=event_id, is_refunded=False).values_list("seat_id", flat=True)
+        return set(sold) | EventQueryPlan.held_seat_ids()
@@ -0,0 +1,23 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+class _EchoBuffer():
+    def write(self, value: str) -> str:
+        return value
+
+class ExportStreamProvider():
+    @staticmethod
+    def csv(rows: Iterable[dict], header: list[str]) -> Iterator[str]:
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(header)
+
+        for row in rows:
+            yield writer.writerow([row[column] for column in header])
+
+    @staticmethod
+    def ndjson(rows: Iterable[dict]) -> Iterator[str]:
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
@@ -0,0 +1,125 @@
+import json
+import base64
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q, QuerySet
+from django.forms import ValidationError
+from rest_framework.request import Request
+from rest_framework.pagination import BasePagination
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a (column, primary key) pair, (start_date, id) by default. The column
+    may also be an annotation of the queryset, such as a search rank; keep it an exact type (integer,
+    date...), a float cursor value does not compare equal to the row it came from.
+
+    Pages are read with a range condition on the composite index instead of COUNT + OFFSET, so
+    every page costs the same however deep the client scrolls. Cursors are opaque base64 strings;
+    the total is only computed on request (`with_total=true`) and cached separately.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    total_query_param = "with_total"
+    page_size = 20
+    max_page_size = 100
+    total_cache_seconds = 5*60
+
+    def __init__(self, descending: bool = False, fields: tuple[str, str] = ("start_date", "id")):
+        self.descending = descending
+        self.fields = fields
+
+    @classmethod
+    def is_requested(cls, request: Request) -> bool:
+        return cls.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        self.page_size = self.__get_page_size(request)
+        self.total = None
+
+        if request.query_params.get(self.total_query_param, "false").lower() == "true":
+            self.total = self.__approximate_total(queryset)
+
+        field, tiebreaker = self.fields
+        cursor = self.__decode(request.query_params.get(self.cursor_query_param), queryset)
+        reverse = cursor is not None and cursor["reverse"]
+        descending = self.descending != reverse
+
+        if cursor is not None:
+            lookup = "lt" if descending else "gt"
+            value, tiebreaker_value = cursor["values"]
+            queryset = queryset.filter(
+                Q(**{f"{field}__{lookup}": value})
+                | Q(**{field: value, f"{tiebreaker}__{lookup}": tiebreaker_value})
+            )
+
+        ordering = (f"-{field}", f"-{tiebreaker}") if descending else (field, tiebreaker)
+        items = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(items) > self.page_size
+        items = items[:self.page_size]
+
+        if reverse:
+            items.reverse()
+
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else cursor is not None
+
+        self.next_cursor = self.__encode(items[-1], False) if items and has_next else None
+        self.previous_cursor = self.__encode(items[0], True) if items and has_previous else None
+
+        return items
+
+    def get_paginated_response(self, data):
+        return {
+            'next': self.next_cursor,
+            'previous': self.previous_cursor,
+            'page_size': self.page_size,
+            'total_items': self.total,
+            'data': data
+        }
+
+    def __get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            raise ValidationError("page_size phải là số nguyên")
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def __approximate_total(self, queryset: QuerySet) -> int:
+        cache_key = f"keyset:total:{hashlib.md5(str(queryset.query).encode()).hexdigest()}"
+        total = cache.get(cache_key)
+
+        if total is None:
+            total = queryset.order_by().count()
+            cache.set(cache_key, total, self.total_cache_seconds)
+
+        return total
+
+    def __encode(self, item, reverse: bool) -> str:
+        values = [getattr(item, field) for field in self.fields]
+        position = {"v": [value.isoformat() if hasattr(value, "isoformat") else value for value in values], "r": reverse}
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def __to_python(self, queryset: QuerySet, field: str, value):
+        try:
+            return queryset.model._meta.get_field(field).to_python(value)
+        except FieldDoesNotExist:
+            return queryset.query.annotations[field].output_field.to_python(value)
+
+    def __decode(self, cursor: str, queryset: QuerySet) -> dict | None:
+        if not cursor:
+            return None
+
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return {
+                "values": [
+                    self.__to_python(queryset, field, value)
+                    for field, value in zip(self.fields, position["v"], strict=True)
+                ],
+                "reverse": bool(position["r"])
+            }
+        except Exception:
+            raise ValidationError("cursor không hợp lệ")
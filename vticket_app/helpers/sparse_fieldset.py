@@ -0,0 +1,46 @@
+from django.db.models import QuerySet
+from django.forms import ValidationError
+from rest_framework.request import Request
+
+class SparseFieldset():
+    """
+    `?fields=` support: the requested names are validated against the serializer, then turned into
+    the serializer's `fields` kwarg and a `.only()` over the matching columns.
+    """
+    query_param = "fields"
+
+    @staticmethod
+    def parse(request: Request, serializer_class, exclude: list[str] = None) -> list[str] | None:
+        value = request.query_params.get(SparseFieldset.query_param, None)
+
+        if not value:
+            return None
+
+        fields = list(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+        available = set(serializer_class(exclude=exclude or []).fields.keys())
+        invalid = [field for field in fields if field not in available]
+
+        if invalid:
+            raise ValidationError(f"fields không hợp lệ: {', '.join(invalid)}")
+
+        return fields
+
+    @staticmethod
+    def only(queryset: QuerySet, fields: list[str] = None, required: tuple = (), dependencies: dict[str, tuple] = None) -> QuerySet:
+        """
+        Load only the concrete columns behind `fields`, plus `required` (columns the caller reads itself,
+        e.g. a pagination key) and the columns computed fields depend on.
+        """
+        if not fields:
+            return queryset
+
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        wanted = {field for field in required if field in columns}
+
+        for field in fields:
+            if field in columns:
+                wanted.add(field)
+
+            wanted.update((dependencies or {}).get(field, ()))
+
+        return queryset.only("pk", *wanted)
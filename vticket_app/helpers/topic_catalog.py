@@ -0,0 +1,50 @@
+import time
+import random
+import threading
+
+from vticket_app.models.event_topic import EventTopic
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
+from vticket_app.serializers.event_topic_serializer import EventTopicSerializer
+
+class TopicCatalog():
+    """
+    Per-process copy of the serialized, non-deleted topics.
+
+    The copy is reloaded when the `event_topic` cache version (bumped on topic create/delete) moves;
+    the version itself is read at most once every `version_check_seconds`.
+    """
+    cache_version_provider = CacheVersionProvider()
+    version_check_seconds = 1
+    __lock = threading.Lock()
+    __version = None
+    __checked_at = 0.0
+    __topics = []
+
+    @classmethod
+    def all(cls, check_version: bool = False) -> list[dict]:
+        now = time.monotonic()
+
+        if check_version or now - cls.__checked_at >= cls.version_check_seconds:
+            version = cls.cache_version_provider.get("event_topic")
+
+            with cls.__lock:
+                if version != cls.__version:
+                    queryset = EventTopic.objects.filter(deleted_at=None).order_by("id")
+                    cls.__topics = [dict(topic) for topic in EventTopicSerializer(queryset, many=True).data]
+                    cls.__version = version
+
+                cls.__checked_at = now
+
+        return cls.__topics
+
+    @classmethod
+    def version(cls) -> int:
+        """Version of the copy held in memory, checked against the cache first; use it to build ETags."""
+        cls.all(check_version=True)
+        return cls.__version
+
+    @classmethod
+    def sample(cls, k: int, seed: int = None) -> list[dict]:
+        """Random topics; the same `seed` gives the same sample for a given catalog version."""
+        topics = cls.all()
+        return random.Random(seed).sample(topics, min(k, len(topics)))
@@ -0,0 +1,160 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+import requests
+from django.core.cache import cache
+
+from vticket_app.configs.related_services import RelatedService
+
+class UserProfileProvider():
+    """
+    Account service profiles behind a small per-process LRU and a shared Redis layer.
+
+    Lookups are batched: whatever misses both layers is fetched with a single `/user/list` call.
+    Users the account service does not return are remembered for `miss_seconds`, so unknown ids do
+    not hit it on every request.
+    """
+    __prefix_key = "user_profile"
+    __miss = False
+    __local = OrderedDict()
+    __lock = threading.Lock()
+    local_size = 1024
+    local_seconds = 60
+    cache_seconds = 10*60
+    miss_seconds = 60
+    request_timeout = 5
+
+    def __key(self, user_id: int) -> str:
+        return f"{self.__prefix_key}:{user_id}"
+
+    def __internal_key(self, user_id: int) -> str:
+        return f"{self.__prefix_key}:internal:{user_id}"
+
+    def get(self, user_id: int) -> dict | None:
+        return self.get_many([user_id]).get(user_id)
+
+    def get_many(self, user_ids: list[int]) -> dict[int, dict]:
+        keys = {self.__key(user_id): user_id for user_id in dict.fromkeys(user_ids)}
+        entries = self.__cached_many(list(keys))
+        missing = [user_id for key, user_id in keys.items() if key not in entries]
+
+        if missing:
+            fetched = self.__fetch(missing)
+
+            if fetched is not None:
+                found = {self.__key(user_id): profile for user_id, profile in fetched.items()}
+                self.__store_many(found, self.cache_seconds)
+                self.__store_many({self.__key(user_id): self.__miss for user_id in missing if user_id not in fetched}, self.miss_seconds)
+                entries.update(found)
+
+        return {keys[key]: profile for key, profile in entries.items() if profile is not self.__miss}
+
+    def get_internal(self, user_id: int) -> dict | None:
+        """The account service's internal view of a user (`/user/{id}/internal`), e.g. an organizer's `org_info`."""
+        key = self.__internal_key(user_id)
+        entries = self.__cached_many([key])
+
+        if key not in entries:
+            fetched = self.__fetch_internal(user_id)
+
+            if fetched is None:
+                return None
+
+            entries[key] = fetched or self.__miss
+            self.__store_many({key: entries[key]}, self.cache_seconds if fetched else self.miss_seconds)
+
+        return entries[key] or None
+
+    def __cached_many(self, keys: list[str]) -> dict:
+        entries = self.__local_get_many(keys)
+        missing = [key for key in keys if key not in entries]
+
+        if missing:
+            cached = cache.get_many(missing)
+            self.__local_set_many(cached, self.local_seconds)
+            entries.update(cached)
+
+        return entries
+
+    def __store_many(self, entries: dict, seconds: int):
+        if not entries:
+            return
+
+        cache.set_many(entries, seconds)
+        self.__local_set_many(entries, min(seconds, self.local_seconds))
+
+    def __local_get_many(self, keys: list[str]) -> dict:
+        now = time.monotonic()
+        entries = {}
+
+        with self.__lock:
+            for key in keys:
+                entry = self.__local.get(key)
+
+                if entry is None:
+                    continue
+
+                if entry[0] < now:
+                    del self.__local[key]
+                    continue
+
+                self.__local.move_to_end(key)
+                entries[key] = entry[1]
+
+        return entries
+
+    def __local_set_many(self, entries: dict, seconds: int):
+        expires_at = time.monotonic() + seconds
+
+        with self.__lock:
+            for key, value in entries.items():
+                self.__local[key] = (expires_at, value)
+                self.__local.move_to_end(key)
+
+            while len(self.__local) > self.local_size:
+                self.__local.popitem(last=False)
+
+    def __fetch(self, user_ids: list[int]) -> dict[int, dict] | None:
+        """Profiles returned by `/user/list`, or None when the account service could not be reached."""
+        try:
+            response = requests.post(
+                url=f'{RelatedService.account}/user/list',
+                headers={
+                    "Content-type": "application/json"
+                },
+                data=json.dumps(
+                    {
+                        "ids": user_ids
+                    }
+                ),
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
+
+            return {user["id"]: user for user in response.json()["data"]}
+        except Exception as e:
+            print(e)
+            return None
+
+    def __fetch_internal(self, user_id: int) -> dict | None:
+        """The internal payload, `{}` for an unknown user, or None when the account service could not be reached."""
+        try:
+            response = requests.get(
+                url=f'{RelatedService.account}/user/{user_id}/internal',
+                headers={
+                    "Content-type": "application/json"
+                },
+                timeout=self.request_timeout
+            )
+
+            if response.status_code == 404:
+                return {}
+
+            response.raise_for_status()
+
+            return response.json()["data"] or {}
+        except Exception as e:
+            print(e)
+            return None
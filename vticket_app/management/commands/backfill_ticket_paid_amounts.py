@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from vticket_app.services.ticket_service import TicketService
+from vticket_app.services.sales_rollup_service import SalesRollupService
+
+class Command(BaseCommand):
+    help = "Fetch historical paid amounts from the payment service into user_ticket, then rebuild daily_event_sales"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Payments handled per batch")
+        parser.add_argument("--concurrency", type=int, default=None, help="Maximum parallel calls to the payment service")
+
+    def handle(self, *args, **options):
+        updated = TicketService().backfill_paid_amounts(options["batch_size"], options["concurrency"])
+        self.stdout.write(f"Backfilled {updated} tickets")
+
+        count = SalesRollupService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily_event_sales rows"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from vticket_app.services.seat_counter_service import SeatCounterService
+
+class Command(BaseCommand):
+    help = "Check the seat counters of ticket types and events against a recount"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Overwrite the mismatching counters with the recounted values")
+
+    def handle(self, *args, **options):
+        mismatches = SeatCounterService().check(options["fix"])
+
+        for mismatch in mismatches:
+            self.stdout.write(f"{mismatch['model']} {mismatch['id']}: (total, sold, available) = {mismatch['counters']}, expected {mismatch['expected']}")
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All seat counters are consistent"))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(mismatches)} counters"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} counters are inconsistent, rerun with --fix to repair them"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from vticket_app.services.sales_rollup_service import SalesRollupService
+
+class Command(BaseCommand):
+    help = "Rebuild the daily_event_sales rollup from user_ticket"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, default=None, help="Only rebuild the given event id")
+
+    def handle(self, *args, **options):
+        count = SalesRollupService().rebuild(options["event"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily_event_sales rows"))
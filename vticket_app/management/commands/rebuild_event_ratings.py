@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from vticket_app.services.feedback_service import FeedbackService
+
+class Command(BaseCommand):
+    help = "Rebuild the event_rating aggregates from feedback"
+
+    def handle(self, *args, **options):
+        count = FeedbackService().rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} event_rating rows"))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from vticket_app.services.event_service import EventService
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vector of every event"
+
+    def handle(self, *args, **options):
+        count = EventService().update_search_vector()
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} events"))
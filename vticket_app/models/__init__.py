@@ -1,4 +1,8 @@
 from vticket_app.models.event_2_event_topic import Event2EventTopic
 from vticket_app.models.support_response import SupportResponse
 from vticket_app.models.feedback import Feedback
-from vticket_app.models.feedback_reply import FeedbackReply
\ No newline at end of file
+from vticket_app.models.feedback_reply import FeedbackReply
+from vticket_app.models.daily_event_sales import DailyEventSales
+from vticket_app.models.hourly_ticket_type_sales import HourlyTicketTypeSales
+from vticket_app.models.related_event import RelatedEvent
+from vticket_app.models.event_rating import EventRating
\ No newline at end of file
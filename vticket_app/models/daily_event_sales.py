@@ -0,0 +1,22 @@
+from django.db import models
+
+from vticket_app.models.event import Event
+from vticket_app.models.ticket_type import TicketType
+
+class DailyEventSales(models.Model):
+    class Meta:
+        db_table = "daily_event_sales"
+        constraints = [
+            models.UniqueConstraint(fields=["event", "ticket_type", "day"], name="daily_event_sales_unique_bucket")
+        ]
+        indexes = [
+            models.Index(fields=["event", "day"]),
+            models.Index(fields=["day"])
+        ]
+
+    id = models.AutoField(primary_key=True)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="daily_sales")
+    ticket_type = models.ForeignKey(TicketType, on_delete=models.CASCADE, related_name="daily_sales")
+    day = models.DateField(null=False)
+    tickets = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
@@ -1,10 +1,21 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 
 from vticket_app.models.event_topic import EventTopic
 
 class Event(models.Model):
     class Meta:
         db_table = "event"
+        indexes = [
+            GinIndex(fields=["search_vector"], name="event_search_vector_idx"),
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="event_name_trgm_idx"),
+            models.Index(fields=["start_date", "id"], name="event_start_date_id_idx"),
+            models.Index(fields=["owner_id", "start_date", "id"], name="event_owner_start_date_id_idx"),
+            models.Index(fields=["-sold_seats", "-id"], name="event_sold_seats_idx"),
+            models.Index(fields=["-available_seats", "-id"], name="event_available_seats_idx")
+        ]
 
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=500)
@@ -16,4 +27,8 @@ class Event(models.Model):
     banner_url = models.URLField(null=True)
     event_topic = models.ManyToManyField(EventTopic, related_name="events", through="vticket_app.Event2EventTopic")
     owner_id = models.IntegerField(null=False)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    total_seats = models.IntegerField(default=0, editable=False)
+    sold_seats = models.IntegerField(default=0, editable=False)
+    available_seats = models.IntegerField(default=0, editable=False)
\ No newline at end of file
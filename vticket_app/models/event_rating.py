@@ -0,0 +1,17 @@
+from django.db import models
+
+from vticket_app.models.event import Event
+
+class EventRating(models.Model):
+    class Meta:
+        db_table = "event_rating"
+
+    id = models.AutoField(primary_key=True)
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name="rating")
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    score_1 = models.IntegerField(default=0)
+    score_2 = models.IntegerField(default=0)
+    score_3 = models.IntegerField(default=0)
+    score_4 = models.IntegerField(default=0)
+    score_5 = models.IntegerField(default=0)
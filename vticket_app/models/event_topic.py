@@ -1,8 +1,13 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 
 class EventTopic(models.Model):
     class Meta:
         db_table = "event_topic"
+        indexes = [
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="event_topic_name_trgm_idx")
+        ]
 
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=500)
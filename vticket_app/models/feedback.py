@@ -5,6 +5,9 @@ from vticket_app.models.event import Event
 class Feedback(models.Model):
     class Meta:
         db_table = "feedback"
+        indexes = [
+            models.Index(fields=["event", "-submited_at", "-id"], name="feedback_event_submited_idx")
+        ]
 
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=100)
@@ -0,0 +1,17 @@
+from django.db import models
+
+from vticket_app.models.event import Event
+from vticket_app.models.ticket_type import TicketType
+
+class HourlyTicketTypeSales(models.Model):
+    """Read-only materialized view, see sql/views/hourly_ticket_type_sales.sql."""
+    class Meta:
+        db_table = "hourly_ticket_type_sales"
+        managed = False
+
+    id = models.BigIntegerField(primary_key=True)
+    event = models.ForeignKey(Event, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    ticket_type = models.ForeignKey(TicketType, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    hour = models.DateTimeField()
+    tickets = models.IntegerField()
+    revenue = models.BigIntegerField()
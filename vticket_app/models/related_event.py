@@ -0,0 +1,19 @@
+from django.db import models
+
+from vticket_app.models.event import Event
+
+class RelatedEvent(models.Model):
+    class Meta:
+        db_table = "related_event"
+        constraints = [
+            models.UniqueConstraint(fields=["event", "related_event"], name="related_event_unique_pair")
+        ]
+        indexes = [
+            models.Index(fields=["event", "-score"])
+        ]
+
+    id = models.AutoField(primary_key=True)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="related_events")
+    related_event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="related_from")
+    score = models.FloatField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
@@ -11,4 +11,7 @@ class TicketType(models.Model):
     name = models.CharField(max_length=150)
     description = models.CharField(max_length=500)
     price = models.IntegerField(validators=[MinValueValidator(0)])
-    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="ticket_types")
\ No newline at end of file
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="ticket_types")
+    total_seats = models.IntegerField(default=0, editable=False)
+    sold_seats = models.IntegerField(default=0, editable=False)
+    available_seats = models.IntegerField(default=0, editable=False)
\ No newline at end of file
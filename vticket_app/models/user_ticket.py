@@ -11,4 +11,6 @@ class UserTicket(models.Model):
     seat = models.ForeignKey(SeatConfiguration, on_delete=models.CASCADE, related_name="user_tickets")
     is_refunded = models.BooleanField(null=False)
     payment_id = models.IntegerField(null=True, default=None)
-    paid_at = models.DateTimeField(null=True, default=None)
\ No newline at end of file
+    paid_at = models.DateTimeField(null=True, default=None)
+    paid_amount = models.IntegerField(null=True, default=None)
+    discount_amount = models.IntegerField(null=True, default=None)
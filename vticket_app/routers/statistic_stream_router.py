@@ -0,0 +1,7 @@
+from django.urls import path
+
+from vticket_app.views.statistic_stream_view import stream_event_statistic
+
+urls = [
+    path("statistic/<int:pk>/event/stream", stream_event_statistic, name="statistic-event-stream")
+]
@@ -7,7 +7,7 @@ from vticket_app.models.event_topic import EventTopic
 class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
-        exclude = ["owner_id"]
+        exclude = ["owner_id", "search_vector"]
 
     def __init__(self, *args, **kwargs):
         existing = set(self.fields.keys())
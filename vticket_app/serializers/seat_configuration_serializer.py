@@ -20,8 +20,21 @@ class SeatConfigurationSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance: SeatConfiguration):
         re = super().to_representation(instance)
-        is_not_available = (
-            instance.user_tickets.filter(is_refunded=False).exists()
-            or bool(cache.keys(f"booking:*:seat:{instance.id}"))
-        )
-        return {**re, "is_not_available": is_not_available}
\ No newline at end of file
+
+        if not self.context.get("seat_availability", True):
+            return re
+        
+        held_seat_ids = self.context.get("held_seat_ids", None)
+        is_sold = getattr(instance, "is_sold", None)
+
+        if is_sold is None:
+            is_sold = instance.user_tickets.filter(is_refunded=False).exists()
+
+        if is_sold:
+            is_not_available = True
+        elif held_seat_ids is not None:
+            is_not_available = instance.id in held_seat_ids
+        else:
+            is_not_available = bool(cache.keys(f"booking:*:seat:{instance.id}"))
+
+        return {**re, "is_not_available": is_not_available}
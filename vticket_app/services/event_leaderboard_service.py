@@ -0,0 +1,56 @@
+import datetime
+from collections import Counter
+
+from django.db.models import Sum
+from django_redis import get_redis_connection
+
+from vticket_app.models.event import Event
+from vticket_app.models.daily_event_sales import DailyEventSales
+from vticket_app.models.seat_configuration import SeatConfiguration
+
+class EventLeaderboardService():
+    all_events_key = "leaderboard:events"
+    upcoming_events_key = "leaderboard:upcoming_events"
+
+    def record_sales(self, seats: list[SeatConfiguration]):
+        try:
+            pipeline = get_redis_connection("default").pipeline()
+
+            for event_id, count in Counter(seat.ticket_type.event_id for seat in seats).items():
+                pipeline.zincrby(self.all_events_key, count, event_id)
+                pipeline.zincrby(self.upcoming_events_key, count, event_id)
+
+            pipeline.execute()
+        except Exception as e:
+            print(e)
+
+    def top(self, limit: int, upcoming: bool = False) -> list[tuple[int, int]]:
+        key = self.upcoming_events_key if upcoming else self.all_events_key
+        members = get_redis_connection("default").zrevrange(key, 0, limit - 1, withscores=True)
+        return [(int(member), int(score)) for member, score in members]
+
+    def reconcile(self) -> int:
+        """Rebuild both sorted sets from Postgres, dropping events that have already started from the upcoming one."""
+        today = datetime.date.today()
+        sold = (
+            DailyEventSales.objects
+            .values("event_id")
+            .annotate(total_tickets=Sum("tickets"))
+            .filter(total_tickets__gt=0)
+            .values_list("event_id", "total_tickets")
+        )
+        all_events = dict(sold)
+        upcoming_ids = set(Event.objects.filter(id__in=all_events.keys(), start_date__gte=today).values_list("id", flat=True))
+        upcoming_events = {event_id: tickets for event_id, tickets in all_events.items() if event_id in upcoming_ids}
+
+        connection = get_redis_connection("default")
+        pipeline = connection.pipeline()
+
+        for key, scores in ((self.all_events_key, all_events), (self.upcoming_events_key, upcoming_events)):
+            pipeline.delete(key)
+
+            if scores:
+                pipeline.zadd(key, scores)
+
+        pipeline.execute()
+        return len(all_events)
@@ -1,11 +1,17 @@
+import re
+import time
 import dataclasses
 from datetime import datetime
+from celery import current_app
+from django.db import transaction
 from django.utils import timezone
+from django.core.cache import cache
 from typing import Union
-from django.db.models import Q
-import requests
+from django.db.models import F, Func, Value, BigIntegerField
+from django.db.models.functions import Cast
+from django.forms import ValidationError
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
 
-from vticket_app.configs.related_services import RelatedService
 from vticket_app.dtos.user_dto import UserDTO
 from vticket_app.models.event import Event
 from vticket_app.dtos.create_event_dto import CreateEventDto
@@ -15,10 +21,22 @@ from vticket_app.models.notification_subscription import NotificationSubscriptio
 from vticket_app.serializers.event_serializer import EventSerializer
 from vticket_app.services.ticket_service import TicketService
 from vticket_app.enums.fee_type_enum import FeeTypeEnum
+from vticket_app.enums.event_ordering_enum import EventOrderingEnum
 from vticket_app.tasks.queue_tasks import async_send_email_to_all_users
+from vticket_app.helpers.event_query_plan import EventQueryPlan
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
+from vticket_app.helpers.user_profile_provider import UserProfileProvider
 
 class EventService():
     ticket_service = TicketService()
+    cache_version_provider = CacheVersionProvider()
+    user_profile_provider = UserProfileProvider()
+    event_detail_cache_seconds = 10*60
+    search_config = "simple"
+    search_rank_scale = 1e6
+    suggest_min_length = 2
+    suggest_max_length = 100
+    suggest_cache_seconds = 60
 
     def create_event(self, event: CreateEventDto) -> Event:
         try:
@@ -35,12 +53,16 @@ class EventService():
             if instance.id is None:
                 return None
             
+            self.update_search_vector([instance.id])
+            
             if not self.ticket_service.create_ticket_types(_ticket_types, instance):
                 return None
             
             if not self.create_event_topics(_event_topics, instance):
                 return None
             
+            transaction.on_commit(lambda: current_app.send_task("vticket_app.tasks.event_tasks.recompute_related_events", kwargs={"event_id": instance.id}))
+            
             return instance
         except Exception as e:
             print(e)
@@ -60,6 +82,7 @@ class EventService():
                 )
 
             Event2EventTopic.objects.bulk_create(e2et)
+            self.invalidate_event_detail(event.id)
             
             return True
         except Exception as e:
@@ -72,17 +95,108 @@ class EventService():
     def all(self) -> list[Event]:
         return Event.objects.all()
     
-    def search_event(self, keyword: str) -> list[Event]:
-        if keyword is None:
+    def __unaccent(self, expression):
+        return Func(expression, function="unaccent")
+    
+    def update_search_vector(self, event_ids: list[int] = None) -> int:
+        queryset = Event.objects.all() if event_ids is None else Event.objects.filter(id__in=event_ids)
+        return queryset.update(
+            search_vector=(
+                SearchVector(self.__unaccent(F("name")), weight="A", config=self.search_config)
+                + SearchVector(self.__unaccent(F("location")), weight="B", config=self.search_config)
+                + SearchVector(self.__unaccent(F("description")), weight="C", config=self.search_config)
+            )
+        )
+    
+    def get_ordering_fields(self, order_by: str) -> tuple[str, str]:
+        """(column, id) pair behind an `order_by` value, both sorted descending; also the keyset of its cursor pages."""
+        if order_by not in EventOrderingEnum.values:
+            raise ValidationError(f"order_by phải là một trong {', '.join(EventOrderingEnum.values)}")
+        
+        return {
+            EventOrderingEnum.popularity: ("sold_seats", "id"),
+            EventOrderingEnum.availability: ("available_seats", "id")
+        }[EventOrderingEnum(order_by)]
+    
+    def __ordering(self, order_by: str) -> tuple:
+        return tuple(f"-{field}" for field in self.get_ordering_fields(order_by))
+    
+    def __rank(self, query: SearchQuery):
+        """
+        Search rank scaled to an integer. `SearchRank` is a float4, which a cursor cannot carry back exactly;
+        an integer rank compares equal to itself, so ties at a page boundary are neither lost nor repeated.
+        """
+        return Cast(SearchRank(F("search_vector"), query)*Value(self.search_rank_scale), output_field=BigIntegerField())
+    
+    def get_search_keyset_fields(self, keyword: str, order_by: str = None) -> tuple[str, str]:
+        """Keyset of the cursor pages of `search_event`, matching its (descending) ordering."""
+        if order_by is not None:
+            return self.get_ordering_fields(order_by)
+        
+        return ("rank", "id") if re.findall(r"\w+", keyword or "") else ("start_date", "id")
+    
+    def get_upcomming_keyset_fields(self, order_by: str = None) -> tuple[str, str]:
+        """Keyset of the cursor pages of `get_upcomming_events`: ascending start date, or descending `order_by` columns."""
+        return self.get_ordering_fields(order_by) if order_by is not None else ("start_date", "id")
+    
+    def search_event(self, keyword: str, order_by: str = None, available_only: bool = False) -> list[Event]:
+        terms = re.findall(r"\w+", keyword or "")
+
+        if not terms:
             queryset = self.all()
+            ordering = ("-start_date", "-id")
         else:
-            queryset = Event.objects.filter(
-                Q(name__icontains=keyword)
-                | Q(description__icontains=keyword)
+            query = SearchQuery(
+                self.__unaccent(Value(" & ".join(f"{term}:*" for term in terms))),
+                config=self.search_config,
+                search_type="raw"
             )
-            
+            queryset = Event.objects.filter(search_vector=query).annotate(rank=self.__rank(query))
+            ordering = ("-rank", "-id")
+
+        if available_only:
+            queryset = queryset.filter(available_seats__gt=0)
+
+        if order_by is not None:
+            ordering = self.__ordering(order_by)
+
+        return queryset.order_by(*ordering)
+    
+    def suggest(self, keyword: str, limit: int = 10) -> dict:
+        """
+        Typeahead suggestions: ids and names of the events and topics whose name contains the keyword.
+
+        The `icontains` lookups are served by the trigram indexes on UPPER(name); results are cached
+        for a short time per normalised keyword so that popular prefixes skip the database.
+        """
+        keyword = " ".join((keyword or "").split()).lower()[:self.suggest_max_length]
 
-        return queryset.order_by("-start_date")
+        if len(keyword) < self.suggest_min_length:
+            return {"events": [], "topics": []}
+        
+        cache_key = f"event:suggest:{limit}:{keyword}"
+        result = cache.get(cache_key)
+
+        if result is None:
+            result = {
+                "events": list(
+                    Event.objects
+                    .filter(name__icontains=keyword)
+                    .annotate(similarity=TrigramWordSimilarity(keyword, "name"))
+                    .order_by("-similarity", "-start_date")
+                    .values("id", "name")[:limit]
+                ),
+                "topics": list(
+                    EventTopic.objects
+                    .filter(deleted_at=None, name__icontains=keyword)
+                    .annotate(similarity=TrigramWordSimilarity(keyword, "name"))
+                    .order_by("-similarity", "id")
+                    .values("id", "name")[:limit]
+                )
+            }
+            cache.set(cache_key, result, self.suggest_cache_seconds)
+
+        return result
     
     def get_value_types_enum(self) -> list:
         values = [choice.value for choice in FeeTypeEnum]
@@ -93,6 +207,7 @@ class EventService():
             instance = Event.objects.get(id=event_id)
             instance.banner_url = banner_url
             instance.save(update_fields=["banner_url"])
+            self.invalidate_event_detail(event_id)
             
             return True
         except Exception as e:
@@ -105,9 +220,79 @@ class EventService():
         except Exception as e:
             return None
         
+    def invalidate_event_detail(self, event_id: int):
+        """Bump the event and catalog versions once the surrounding transaction (if any) has committed."""
+        transaction.on_commit(lambda: self.__bump_event_versions(event_id))
+
+    def __bump_event_versions(self, event_id: int):
+        self.cache_version_provider.bump("event", event_id)
+        self.cache_version_provider.bump("event_catalog")
+
+    def get_event_detail_versions(self, event_id: int) -> list:
+        """Version counters the detail response depends on. Booking holds expire silently, so the current minute is one of them."""
+        return [
+            self.cache_version_provider.get("event", event_id),
+            self.cache_version_provider.get("event_topic"),
+            self.cache_version_provider.get("event_seats", event_id),
+            int(time.time()//60)
+        ]
+
+    def get_catalog_version(self) -> int:
+        return self.cache_version_provider.get("event_catalog")
+
+    def get_event_detail_payload(self, event_id: int, fields: list[str] = None) -> dict | None:
+        """
+        Event detail response. Everything but seat availability is cached per event version and
+        topic catalog version; availability is merged in from one sold-seat query and the booking holds.
+
+        With `fields` the event is cut down to those keys, and availability is only looked up when
+        `ticket_types` is one of them.
+        """
+        event_version = self.cache_version_provider.get("event", event_id)
+        topic_version = self.cache_version_provider.get("event_topic")
+        cache_key = f"event:detail:{event_id}:v{event_version}:t{topic_version}"
+        payload = cache.get(cache_key)
+
+        if payload is None:
+            event = EventQueryPlan.apply(Event.objects.filter(id=event_id), seat_availability=False).first()
+
+            if event is None:
+                return None
+            
+            payload = {
+                "event": EventSerializer(event, context={"seat_availability": False}).data,
+                "related_events": EventSerializer(self.get_related_events(event), many=True, exclude=["ticket_types"]).data,
+                "org_info": self.get_owner_info(event)
+            }
+            cache.set(cache_key, payload, self.event_detail_cache_seconds)
+
+        if fields:
+            payload = {**payload, "event": {key: value for key, value in payload["event"].items() if key in fields}}
+
+        if "ticket_types" not in payload["event"]:
+            return payload
+
+        unavailable_seat_ids = EventQueryPlan.unavailable_seat_ids(event_id)
+
+        for ticket_type in payload["event"].get("ticket_types", []):
+            for seat in ticket_type.get("seat_configurations", []):
+                seat["is_not_available"] = seat["id"] in unavailable_seat_ids
+
+        return payload
+        
     def get_related_events(self, event: Event):
+        """Related events precomputed by `RelatedEventService`, falling back to upcoming events sharing a topic."""
         today = timezone.now().date()
-        events = Event.objects.filter(
+        events = list(
+            EventQueryPlan.apply(Event.objects, exclude=["ticket_types"])
+            .filter(related_from__event_id=event.id, start_date__gt=today)
+            .order_by("-related_from__score")[:8]
+        )
+
+        if events:
+            return events
+        
+        events = EventQueryPlan.apply(Event.objects, exclude=["ticket_types"]).filter(
             event_topic__in=event.event_topic.all(),
             start_date__gt=today
         ).exclude(id=event.id).distinct().order_by('start_date')[:8]
@@ -115,16 +300,9 @@ class EventService():
     
     def get_owner_info(self, event: Event):
         try:
-            response = requests.get(
-                url=f'{RelatedService.account}/user/{event.owner_id}/internal',
-                headers={
-                    "Content-type": "application/json"
-                }
-            )
-
-            return response.json()["data"]
+            return self.user_profile_provider.get_internal(event.owner_id)
         except Exception as e:
-            print(e, response.text)
+            print(e)
             return None
     
     def get_all_event(self, user_id: int) -> list[Event]:
@@ -132,6 +310,9 @@ class EventService():
     
     def can_view_statistic(self, event: Event, user: UserDTO) -> bool:
         return event.owner_id == user.id
+    
+    def can_export_gate_bundle(self, event: Event, user: UserDTO) -> bool:
+        return event.owner_id == user.id
       
     def send_new_event_email(self, event: Event):
         try:
@@ -158,11 +339,17 @@ class EventService():
             print(e)
 
 
-    def get_upcomming_events(self) -> Union[list|None]:
+    def get_upcomming_events(self, order_by: str = None, available_only: bool = False) -> Union[list|None]:
         try:
             _today = datetime.now().date()
-            return Event.objects.filter(start_date__gte=_today).order_by("start_date")
-        
+            queryset = Event.objects.filter(start_date__gte=_today)
+
+            if available_only:
+                queryset = queryset.filter(available_seats__gt=0)
+
+            return queryset.order_by(*(self.__ordering(order_by) if order_by is not None else ("start_date", "id")))
+        except ValidationError:
+            raise
         except Exception as e:
             print(e)
             return None
@@ -1,23 +1,30 @@
 import datetime
 from vticket_app.models.event_topic import EventTopic
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
+from vticket_app.helpers.topic_catalog import TopicCatalog
 from vticket_app.serializers.event_topic_serializer import EventTopicSerializer
 
 class EventTopicService():
     serializer_class = EventTopicSerializer
+    cache_version_provider = CacheVersionProvider()
 
     def create_topic(self, name: str, description: str, symbolic_image_url: str = None) -> bool:
         new_topic = EventTopic.objects.create(name=name, description=description, symbolic_image_url=symbolic_image_url)
+        self.cache_version_provider.bump("event_topic")
         return bool(new_topic.id)
     
+    def get_version(self) -> int:
+        return TopicCatalog.version()
+    
     def get_all_topics(self) -> list:
-        queryset = EventTopic.objects.filter(deleted_at=None)
-        return EventTopicSerializer(queryset, many=True).data
+        return TopicCatalog.all()
     
     def delete_topic(self, id: int) -> bool:
         try:
             instance = EventTopic.objects.get(id=id)
             instance.deleted_at = datetime.datetime.now()
             instance.save()
+            self.cache_version_provider.bump("event_topic")
             
             return True
         except Exception as e:
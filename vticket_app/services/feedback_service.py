@@ -1,41 +1,85 @@
 import dataclasses
-import json
 
-import requests
+from django.db import transaction
+from django.db.models import F, Q, Count, Sum
 
-from vticket_app.configs.related_services import RelatedService
 from vticket_app.dtos.user_dto import UserDTO
 from vticket_app.models.feedback import Feedback
+from vticket_app.models.event_rating import EventRating
 from vticket_app.dtos.create_feedback_dto import CreateFeedbackDto
 from vticket_app.serializers.feedback_serializer import FeedbackSerializer
+from vticket_app.helpers.user_profile_provider import UserProfileProvider
 
 class FeedbackService:
+    user_profile_provider = UserProfileProvider()
+
+    rating_scores = range(1, 6)
+
     def create_feedback(self, feedback: CreateFeedbackDto) -> bool:
         _data = dataclasses.asdict(feedback)
         instance = Feedback(**_data)
-        instance.save()
+
+        with transaction.atomic():
+            instance.save()
+            self.__add_rating(instance.event_id, instance.rating_score)
         
         return instance.id is not None
     
-    def get_feedbacks_by_event_id(self, event_id: int) -> list:
-        queryset = Feedback.objects.filter(event__id=event_id)
-        ids = queryset.values_list('owner_id', flat=True)
-        response = requests.post(
-            url=f'{RelatedService.account}/user/list',
-            headers={
-                "Content-type": "application/json"
-            },
-            data=json.dumps(
-                {
-                    "ids": list(ids)
-                }
+    def __add_rating(self, event_id: int, rating_score: int):
+        rating, _ = EventRating.objects.get_or_create(event_id=event_id)
+        EventRating.objects.filter(id=rating.id).update(
+            rating_count=F("rating_count") + 1,
+            rating_sum=F("rating_sum") + rating_score,
+            **{f"score_{rating_score}": F(f"score_{rating_score}") + 1}
+        )
+
+    def get_rating(self, event_id: int) -> dict:
+        rating = EventRating.objects.filter(event_id=event_id).first()
+
+        if rating is None:
+            return {"count": 0, "average": None, "histogram": {str(score): 0 for score in self.rating_scores}}
+        
+        return {
+            "count": rating.rating_count,
+            "average": round(rating.rating_sum/rating.rating_count, 2) if rating.rating_count else None,
+            "histogram": {str(score): getattr(rating, f"score_{score}") for score in self.rating_scores}
+        }
+    
+    def rebuild_ratings(self) -> int:
+        """Recompute every event's rating aggregates from `feedback`."""
+        rows = (
+            Feedback.objects
+            .values("event_id")
+            .annotate(
+                rating_count=Count("id"),
+                rating_sum=Sum("rating_score"),
+                **{f"score_{score}": Count("id", filter=Q(rating_score=score)) for score in self.rating_scores}
             )
+            .order_by()
         )
-        resp_data = response.json()
 
-        owners = {user['id']: user for user in resp_data['data']}
+        with transaction.atomic():
+            EventRating.objects.all().delete()
+            instances = EventRating.objects.bulk_create([EventRating(**row) for row in rows], batch_size=1000)
+
+        return len(instances)
+    
+    def get_feedback_queryset(self, event_id: int):
+        return (
+            Feedback.objects
+            .filter(event__id=event_id)
+            .prefetch_related("feedback_replies")
+            .order_by("-submited_at", "-id")
+        )
+    
+    def get_feedbacks_by_event_id(self, event_id: int) -> list:
+        return self.serialize_feedbacks(self.get_feedback_queryset(event_id))
+
+    def serialize_feedbacks(self, feedbacks: list[Feedback]) -> list:
+        """Serialize feedbacks with their replies and owner profiles, the profiles fetched in one batch."""
+        owners = self.user_profile_provider.get_many([feedback.owner_id for feedback in feedbacks])
 
-        feedback_data = FeedbackSerializer(queryset, many=True).data
+        feedback_data = FeedbackSerializer(feedbacks, many=True).data
 
         for feedback in feedback_data:
             owner_id = feedback['owner_id']
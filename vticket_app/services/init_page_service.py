@@ -1,25 +1,118 @@
+import json
+import time
+import hashlib
 from typing import Union
-from random import sample
 from datetime import datetime
-
-from django.db.models import Q, Count
+from celery import current_app
+from django.core.cache import cache
 
 from vticket_app.models.event import Event
-from vticket_app.models.event_topic import EventTopic
 
 from vticket_app.serializers.event_serializer import EventSerializer
-from vticket_app.serializers.event_topic_serializer import EventTopicSerializer
+from vticket_app.services.event_leaderboard_service import EventLeaderboardService
+from vticket_app.helpers.event_query_plan import EventQueryPlan
+from vticket_app.helpers.topic_catalog import TopicCatalog
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
 
 class InitPageService():
     banner_length = 5
     topic_type_length = 6
     upcomming_events_length = 8
     outstanding_events_length = 6
+    home_cache_key = "init_page:home"
+    home_version_key = "init_page:home"
+    home_lock_key = "init_page:home:lock"
+    home_revalidate_key = "init_page:home:revalidate"
+    home_fresh_seconds = 60
+    home_cache_seconds = 60*60
+    home_lock_seconds = 30
+    home_wait_seconds = 2
+    home_poll_seconds = 0.05
+    event_leaderboard_service = EventLeaderboardService()
+    cache_version_provider = CacheVersionProvider()
+
+    def get_home_payload(self) -> dict:
+        """
+        Home page payload served from the precomputed cache entry.
+
+        Past `home_fresh_seconds` the stale entry is still served while a single background refresh is
+        queued. When there is no entry at all, a single worker builds it inline and the others wait
+        up to `home_wait_seconds` for it, then serve an empty payload rather than build it themselves.
+        Topics are sampled from the in-process catalog, seeded with the home version so that a given
+        ETag always carries the same sample.
+        """
+        entry = cache.get(self.home_cache_key)
+
+        if entry is None:
+            payload = self.refresh_home_payload() or self.__wait_for_home_payload()
+        else:
+            payload = entry["payload"]
+
+            if time.time() - entry["built_at"] > self.home_fresh_seconds and cache.add(self.home_revalidate_key, 1, self.home_lock_seconds):
+                current_app.send_task("vticket_app.tasks.init_page_tasks.refresh_home_page")
+
+        return {
+            **payload,
+            "topic_types": self.get_topic_types(seed=self.cache_version_provider.get(self.home_version_key))
+        }
+
+    def __wait_for_home_payload(self) -> dict:
+        deadline = time.monotonic() + self.home_wait_seconds
+
+        while time.monotonic() < deadline:
+            time.sleep(self.home_poll_seconds)
+            entry = cache.get(self.home_cache_key)
+
+            if entry is not None:
+                return entry["payload"]
+
+        return {
+            "banners": [],
+            "outstanding_events": [],
+            "upcoming_events": []
+        }
+
+    def get_home_versions(self) -> list:
+        return [
+            self.cache_version_provider.get(self.home_version_key),
+            TopicCatalog.version()
+        ]
+
+    def build_home_payload(self) -> dict:
+        return {
+            "banners": self.get_banner(),
+            "outstanding_events": self.get_outstanding_events(),
+            "upcoming_events": self.get_upcomming_events()
+        }
+
+    def refresh_home_payload(self) -> dict | None:
+        """
+        Rebuild the cached home payload; returns None when another worker is already rebuilding it.
+
+        The home version (and so the ETag) is only bumped when the rebuilt payload differs from the
+        cached one.
+        """
+        if not cache.add(self.home_lock_key, 1, self.home_lock_seconds):
+            return None
+        
+        try:
+            previous = cache.get(self.home_cache_key)
+            payload = self.build_home_payload()
+            digest = hashlib.md5(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+            cache.set(self.home_cache_key, {"payload": payload, "built_at": time.time(), "digest": digest}, self.home_cache_seconds)
+
+            if previous is None or previous.get("digest") != digest:
+                self.cache_version_provider.bump(self.home_version_key)
+
+            return payload
+        finally:
+            cache.delete(self.home_lock_key)
+            cache.delete(self.home_revalidate_key)
 
     def get_banner(self) -> Union[list|None]:
         try:
             _today = datetime.now().date()
-            queryset = Event.objects.filter(start_date__gte=_today).order_by("start_date")[:self.banner_length]
+            queryset = EventQueryPlan.apply(Event.objects, exclude=["ticket_types"]).filter(start_date__gte=_today).order_by("start_date")[:self.banner_length]
 
             return EventSerializer(queryset, many=True, exclude=["ticket_types"]).data
         except Exception as e:
@@ -29,19 +122,16 @@ class InitPageService():
     def get_upcomming_events(self) -> Union[list|None]:
         try:
             _today = datetime.now().date()
-            queryset = Event.objects.filter(start_date__gte=_today).order_by("start_date")[:self.upcomming_events_length]
+            queryset = EventQueryPlan.apply(Event.objects, exclude=["ticket_types"]).filter(start_date__gte=_today).order_by("start_date")[:self.upcomming_events_length]
 
             return EventSerializer(queryset, many=True, exclude=["ticket_types"]).data
         except Exception as e:
             print(e)
             return None
         
-    def get_topic_types(self) -> Union[list|None]:
+    def get_topic_types(self, seed: int = None) -> Union[list|None]:
         try:
-            queryset = EventTopic.objects.filter(deleted_at=None)
-            random_queryset = sample(list(queryset), self.topic_type_length)
-
-            return EventTopicSerializer(random_queryset, many=True).data
+            return TopicCatalog.sample(self.topic_type_length, seed)
         except Exception as e:
             print(e)
             return None
@@ -49,12 +139,20 @@ class InitPageService():
     def get_outstanding_events(self) -> Union[list | None]:
         try:
             _today = datetime.now().date()
-            
-            queryset = Event.objects.filter(start_date__gte=_today).annotate(
-                tickets_sold=Count('ticket_types__seat_configurations__user_tickets', filter=Q(ticket_types__seat_configurations__user_tickets__is_refunded=False))
-            ).order_by("-tickets_sold", "start_date")[:self.outstanding_events_length]
+            ranked_ids = [event_id for event_id, _ in self.event_leaderboard_service.top(self.outstanding_events_length*2, upcoming=True)]
+            events_queryset = EventQueryPlan.apply(Event.objects, exclude=["ticket_types"])
+            ranked = events_queryset.filter(id__in=ranked_ids, start_date__gte=_today).in_bulk()
+            events = [ranked[event_id] for event_id in ranked_ids if event_id in ranked][:self.outstanding_events_length]
 
-            return EventSerializer(queryset, many=True, exclude=["ticket_types"]).data
+            if len(events) < self.outstanding_events_length:
+                events += list(
+                    events_queryset
+                    .filter(start_date__gte=_today)
+                    .exclude(id__in=[event.id for event in events])
+                    .order_by("start_date")[:self.outstanding_events_length - len(events)]
+                )
+
+            return EventSerializer(events, many=True, exclude=["ticket_types"]).data
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
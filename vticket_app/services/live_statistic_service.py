@@ -0,0 +1,110 @@
+import json
+from typing import AsyncIterator
+
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from celery import current_app
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis import get_redis_connection
+
+from vticket_app.models.daily_event_sales import DailyEventSales
+from vticket_app.models.seat_configuration import SeatConfiguration
+from vticket_app.helpers.event_query_plan import EventQueryPlan
+
+class LiveStatisticService():
+    __prefix_key = "statistic:live"
+    snapshot_seconds = 60*60
+    heartbeat_seconds = 15
+    publish_debounce_seconds = 1
+
+    def channel(self, event_id: int) -> str:
+        return f"{self.__prefix_key}:event:{event_id}"
+
+    def __snapshot_key(self, event_id: int) -> str:
+        return f"{self.__prefix_key}:snapshot:{event_id}"
+
+    def __debounce_key(self, event_id: int) -> str:
+        return f"{self.__prefix_key}:debounce:{event_id}"
+
+    def build_snapshot(self, event_id: int) -> dict:
+        totals = DailyEventSales.objects.filter(event_id=event_id).aggregate(
+            total_ticket_sold=Coalesce(Sum("tickets"), 0),
+            total_revenue=Coalesce(Sum("revenue"), 0)
+        )
+        holds_in_flight = (
+            SeatConfiguration.objects
+            .filter(id__in=EventQueryPlan.held_seat_ids(), ticket_type__event_id=event_id)
+            .exclude(user_tickets__is_refunded=False)
+            .count()
+        )
+
+        return {
+            "id": event_id,
+            **totals,
+            "holds_in_flight": holds_in_flight
+        }
+
+    def get_snapshot(self, event_id: int) -> dict:
+        snapshot = cache.get(self.__snapshot_key(event_id))
+
+        if snapshot is None:
+            snapshot = self.build_snapshot(event_id)
+            cache.set(self.__snapshot_key(event_id), snapshot, self.snapshot_seconds)
+
+        return snapshot
+
+    def schedule_publish(self, event_ids: list[int]):
+        """
+        Queue a `publish` of the given events, at most one per event every `publish_debounce_seconds`.
+
+        Called from the booking and payment paths, which must not pay for the snapshot queries; the
+        task runs after the debounce window so that it reflects every change made during it.
+        """
+        try:
+            for event_id in set(event_ids):
+                if cache.add(self.__debounce_key(event_id), 1, self.publish_debounce_seconds):
+                    current_app.send_task(
+                        "vticket_app.tasks.statistic_tasks.publish_live_statistic",
+                        kwargs={"event_ids": [event_id]},
+                        countdown=self.publish_debounce_seconds
+                    )
+        except Exception as e:
+            print(e)
+
+    def publish(self, event_ids: list[int]):
+        """Recompute the totals of the given events once and broadcast them to every open dashboard."""
+        try:
+            connection = get_redis_connection("default")
+
+            for event_id in set(event_ids):
+                snapshot = self.build_snapshot(event_id)
+                cache.set(self.__snapshot_key(event_id), snapshot, self.snapshot_seconds)
+                connection.publish(self.channel(event_id), json.dumps(snapshot, cls=DjangoJSONEncoder))
+        except Exception as e:
+            print(e)
+
+    async def stream(self, event_id: int) -> AsyncIterator[str]:
+        snapshot = await sync_to_async(self.get_snapshot)(event_id)
+        yield f"data: {json.dumps(snapshot, cls=DjangoJSONEncoder)}\n\n"
+
+        client = aioredis.from_url(settings.CACHES["default"]["LOCATION"])
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel(event_id))
+
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.heartbeat_seconds)
+
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield f"data: {message['data'].decode()}\n\n"
+        finally:
+            await pubsub.unsubscribe(self.channel(event_id))
+            await pubsub.close()
+            await client.close()
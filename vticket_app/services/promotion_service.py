@@ -6,6 +6,7 @@ from vticket_app.enums.instance_error_enum import InstanceErrorEnum
 from vticket_app.models.promotion import Promotion
 from vticket_app.dtos.create_promotion_dto import CreatePromotionDto
 from vticket_app.serializers.promotion_serializer import PromotionSerializer
+from vticket_app.helpers.sparse_fieldset import SparseFieldset
 from vticket_app.dtos.user_dto import UserDTO
 
 class PromotionService():
@@ -24,9 +25,13 @@ class PromotionService():
             print(e)
             return False
         
-    def get_promotions_by_event_id(self, event_id: int) -> list[dict]:
-        queryset = Promotion.objects.filter(event__id=event_id, deleted_at=None, quantity__gt=0)
-        return PromotionSerializer(queryset, many=True).data
+    def get_promotions_by_event_id(self, event_id: int, fields: list[str] = None) -> list[dict]:
+        queryset = SparseFieldset.only(
+            Promotion.objects.filter(event__id=event_id, deleted_at=None, quantity__gt=0),
+            fields,
+            dependencies={"pretty_name": ("condition", "discount_type", "discount_value", "maximum_reduction_amount", "evaluation_value")}
+        )
+        return PromotionSerializer(queryset, many=True, fields=set(fields or ())).data
     
     def get_promotion_by_id(self, id: int) -> Union[Promotion|None]:
         try:
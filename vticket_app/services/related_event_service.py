@@ -0,0 +1,106 @@
+import math
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+from vticket_app.models.event import Event
+from vticket_app.models.related_event import RelatedEvent
+from vticket_app.models.event_2_event_topic import Event2EventTopic
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
+
+class RelatedEventService():
+    related_length = 8
+    topic_weight = 0.6
+    date_weight = 0.25
+    popularity_weight = 0.15
+    date_horizon_days = 90
+    cache_version_provider = CacheVersionProvider()
+
+    def recompute(self, event_id: int = None) -> int:
+        """
+        Recompute the stored related events, for every event or for one event and the events sharing
+        a topic with it.
+
+        Candidates are the upcoming events sharing at least one topic with the source event, scored by
+        topic overlap (Jaccard), start date proximity and ticket sales. Returns the number of rows written.
+        """
+        today = timezone.now().date()
+        topics = self.__topics()
+        candidates = {
+            event["id"]: event
+            for event in Event.objects.filter(start_date__gt=today).values("id", "start_date", "sold_seats")
+        }
+        candidates_by_topic = defaultdict(set)
+
+        for candidate_id in candidates:
+            for topic_id in topics.get(candidate_id, ()):
+                candidates_by_topic[topic_id].add(candidate_id)
+
+        if event_id is None:
+            sources = Event.objects.all()
+        else:
+            sharing = set().union(*(candidates_by_topic[topic_id] for topic_id in topics.get(event_id, ())))
+            sources = Event.objects.filter(id__in=sharing | {event_id})
+
+        max_popularity = math.log1p(max((candidate["sold_seats"] for candidate in candidates.values()), default=0)) or 1
+        rows = []
+
+        for source in sources.values("id", "start_date"):
+            source_topics = topics.get(source["id"], set())
+            scored = []
+
+            for candidate_id in set().union(*(candidates_by_topic[topic_id] for topic_id in source_topics)) - {source["id"]}:
+                candidate = candidates[candidate_id]
+                scored.append((
+                    self.__score(source_topics, topics[candidate_id], source["start_date"], candidate["start_date"], candidate["sold_seats"], max_popularity),
+                    candidate_id
+                ))
+
+            for score, candidate_id in sorted(scored, reverse=True)[:self.related_length]:
+                rows.append(RelatedEvent(event_id=source["id"], related_event_id=candidate_id, score=round(score, 6)))
+
+        self.__replace(sources, rows)
+        return len(rows)
+
+    def __topics(self) -> dict[int, set[int]]:
+        topics = defaultdict(set)
+        pairs = (
+            Event2EventTopic.objects
+            .filter(deleted_at=None, event_topic__deleted_at=None)
+            .values_list("event_id", "event_topic_id")
+        )
+
+        for event_id, topic_id in pairs:
+            topics[event_id].add(topic_id)
+
+        return topics
+
+    def __score(self, source_topics: set, candidate_topics: set, source_date: date, candidate_date: date, sold_seats: int, max_popularity: float) -> float:
+        topic_overlap = len(source_topics & candidate_topics)/len(source_topics | candidate_topics)
+        date_proximity = max(0, 1 - abs((candidate_date - source_date).days)/self.date_horizon_days)
+        popularity = math.log1p(sold_seats)/max_popularity
+
+        return self.topic_weight*topic_overlap + self.date_weight*date_proximity + self.popularity_weight*popularity
+
+    def __replace(self, sources, rows: list[RelatedEvent]):
+        """Swap the stored rows of the source events and bump the detail cache of those whose list changed."""
+        source_ids = set(sources.values_list("id", flat=True))
+        previous = defaultdict(list)
+
+        for event_id, related_event_id in RelatedEvent.objects.filter(event_id__in=source_ids).order_by("event_id", "-score").values_list("event_id", "related_event_id"):
+            previous[event_id].append(related_event_id)
+
+        current = defaultdict(list)
+
+        for row in rows:
+            current[row.event_id].append(row.related_event_id)
+
+        with transaction.atomic():
+            RelatedEvent.objects.filter(event_id__in=source_ids).delete()
+            RelatedEvent.objects.bulk_create(rows, batch_size=1000)
+
+        for event_id in source_ids:
+            if previous[event_id] != current[event_id]:
+                self.cache_version_provider.bump("event", event_id)
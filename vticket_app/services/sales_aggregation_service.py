@@ -0,0 +1,154 @@
+from datetime import date, datetime, timedelta
+from typing import Iterator, Tuple
+
+from django.forms import ValidationError
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek, TruncMonth
+
+from vticket_app.models.event import Event
+from vticket_app.models.daily_event_sales import DailyEventSales
+from vticket_app.enums.statistic_granularity_enum import StatisticGranularityEnum
+
+class SalesAggregationService():
+    date_format = "%Y-%m-%d"
+    export_chunk_size = 2000
+
+    def parse_date(self, value: str, field_name: str) -> date:
+        try:
+            return datetime.strptime(value, self.date_format).date()
+        except ValueError:
+            raise ValidationError(f"{field_name} phải có định dạng YYYY-MM-DD")
+
+    def parse_granularity(self, value: str) -> StatisticGranularityEnum:
+        if value is None:
+            return StatisticGranularityEnum.day
+
+        if value not in StatisticGranularityEnum.values:
+            raise ValidationError(f"granularity phải là một trong {', '.join(StatisticGranularityEnum.values)}")
+
+        return StatisticGranularityEnum(value)
+
+    def resolve_date_range(self, start_date: str, end_date: str, event: Event = None) -> Tuple[date, date]:
+        today = date.today()
+        end = self.parse_date(end_date, "end_date") if end_date is not None else today
+        start = self.parse_date(start_date, "start_date") if start_date is not None else end
+
+        if start > end:
+            start, end = end, start
+
+        if end > today:
+            end = today
+
+        if event is not None and end > event.start_date:
+            end = event.start_date - timedelta(days=1)
+
+        if start > end:
+            start = end
+
+        return start, end
+
+    def bucket_start(self, day: date, granularity: StatisticGranularityEnum) -> date:
+        if granularity == StatisticGranularityEnum.week:
+            return day - timedelta(days=day.weekday())
+        if granularity == StatisticGranularityEnum.month:
+            return day.replace(day=1)
+        return day
+
+    def bucket_range(self, start_date: date, end_date: date, granularity: StatisticGranularityEnum) -> list[date]:
+        buckets = []
+        current = self.bucket_start(start_date, granularity)
+
+        while current <= end_date:
+            buckets.append(current)
+
+            if granularity == StatisticGranularityEnum.week:
+                current = current + timedelta(days=7)
+            elif granularity == StatisticGranularityEnum.month:
+                current = (current + timedelta(days=32)).replace(day=1)
+            else:
+                current = current + timedelta(days=1)
+
+        return buckets
+
+    def __bucket_expression(self, granularity: StatisticGranularityEnum):
+        return {
+            StatisticGranularityEnum.day: F("day"),
+            StatisticGranularityEnum.week: TruncWeek("day"),
+            StatisticGranularityEnum.month: TruncMonth("day"),
+        }[granularity]
+
+    def __rollup(self, start_date: date, end_date: date, event_id: int = None):
+        queryset = DailyEventSales.objects.filter(day__range=(start_date, end_date))
+
+        if event_id is not None:
+            queryset = queryset.filter(event_id=event_id)
+
+        return queryset
+
+    def sales(
+        self,
+        start_date: date,
+        end_date: date,
+        event_id: int = None,
+        granularity: StatisticGranularityEnum = StatisticGranularityEnum.day,
+        by_ticket_type: bool = False
+    ) -> list[dict]:
+        """
+        Sum sold tickets and revenue per bucket (and optionally per ticket type) from the daily rollup.
+
+        Each row carries `day` (the first day of the bucket), `ticket_sold`, `revenue` and, when
+        `by_ticket_type` is set, `ticket_type_id`.
+        """
+        group_by = ["bucket", "ticket_type_id"] if by_ticket_type else ["bucket"]
+
+        rows = (
+            self.__rollup(start_date, end_date, event_id)
+            .annotate(bucket=self.__bucket_expression(granularity))
+            .values(*group_by)
+            .annotate(ticket_sold=Sum("tickets"), revenue=Sum("revenue"))
+            .order_by(*group_by)
+        )
+
+        return [{"day": row.pop("bucket"), **row} for row in rows]
+
+    def sales_by_bucket(
+        self,
+        start_date: date,
+        end_date: date,
+        event_id: int = None,
+        granularity: StatisticGranularityEnum = StatisticGranularityEnum.day
+    ) -> list[dict]:
+        """Same as `sales` but with one row for every bucket of the range, empty buckets included."""
+        rows = {row["day"]: row for row in self.sales(start_date, end_date, event_id, granularity)}
+
+        return [
+            rows.get(bucket, {"day": bucket, "ticket_sold": 0, "revenue": 0})
+            for bucket in self.bucket_range(start_date, end_date, granularity)
+        ]
+
+    def export_rows(
+        self,
+        start_date: date,
+        end_date: date,
+        event_id: int = None,
+        granularity: StatisticGranularityEnum = StatisticGranularityEnum.day
+    ) -> Iterator[dict]:
+        """Stream per bucket and ticket type sales through a server-side cursor."""
+        rows = (
+            self.__rollup(start_date, end_date, event_id)
+            .annotate(bucket=self.__bucket_expression(granularity))
+            .values("bucket", "event_id", "event__name", "ticket_type_id", "ticket_type__name")
+            .annotate(ticket_sold=Sum("tickets"), revenue=Sum("revenue"))
+            .order_by("bucket", "event_id", "ticket_type_id")
+        )
+
+        for row in rows.iterator(chunk_size=self.export_chunk_size):
+            yield {
+                "date": row["bucket"],
+                "event_id": row["event_id"],
+                "event_name": row["event__name"],
+                "ticket_type_id": row["ticket_type_id"],
+                "ticket_type_name": row["ticket_type__name"],
+                "ticket_sold": row["ticket_sold"],
+                "revenue": row["revenue"]
+            }
@@ -0,0 +1,129 @@
+import pandas as pd
+
+from vticket_app.models.event import Event
+from vticket_app.models.booking import Booking
+from vticket_app.models.user_ticket import UserTicket
+
+class SalesAnalyticsService():
+    time_to_pay_bins = [0, 60, 5*60, 10*60, 15*60, float("inf")]
+    time_to_pay_labels = ["<1m", "1-5m", "5-10m", "10-15m", ">15m"]
+    cohort_days = 14
+
+    def funnel(self, event: Event) -> dict:
+        """
+        Conversion funnel, time-to-pay distribution and daily cohort curves of an event.
+
+        Holds and tickets are loaded with one bulk query each, then matched on (user, seat)
+        with vectorised DataFrame operations.
+        """
+        holds = self.__load_holds(event)
+        tickets = self.__load_tickets(event)
+        bookings = self.__bookings(holds, tickets)
+
+        return {
+            "funnel": self.__funnel(bookings, tickets),
+            "time_to_pay": self.__time_to_pay(bookings),
+            "cohorts": self.__cohorts(bookings)
+        }
+
+    def __load_holds(self, event: Event) -> pd.DataFrame:
+        rows = (
+            Booking.seats.through.objects
+            .filter(seatconfiguration__ticket_type__event_id=event.id)
+            .values_list("booking_id", "booking__user_id", "booking__created_at", "seatconfiguration_id")
+        )
+        holds = pd.DataFrame.from_records(rows, columns=["booking_id", "user_id", "created_at", "seat_id"])
+        holds["created_at"] = pd.to_datetime(holds["created_at"], utc=True)
+        return holds
+
+    def __load_tickets(self, event: Event) -> pd.DataFrame:
+        rows = (
+            UserTicket.objects
+            .filter(seat__ticket_type__event_id=event.id, paid_at__isnull=False)
+            .values_list("user_id", "seat_id", "paid_at", "is_refunded", "discount_amount")
+        )
+        tickets = pd.DataFrame.from_records(rows, columns=["user_id", "seat_id", "paid_at", "is_refunded", "discount_amount"])
+        tickets["paid_at"] = pd.to_datetime(tickets["paid_at"], utc=True)
+        tickets["is_refunded"] = tickets["is_refunded"].astype(bool)
+        tickets["discount_amount"] = tickets["discount_amount"].fillna(0)
+        return tickets
+
+    def __bookings(self, holds: pd.DataFrame, tickets: pd.DataFrame) -> pd.DataFrame:
+        merged = holds.merge(tickets, on=["user_id", "seat_id"], how="left")
+        merged["converted"] = merged["paid_at"].notna() & (merged["paid_at"] >= merged["created_at"])
+        merged["paid_at"] = merged["paid_at"].where(merged["converted"])
+        merged["refunded"] = merged["converted"] & merged["is_refunded"].fillna(False).astype(bool)
+        merged["discounted"] = merged["converted"] & (merged["discount_amount"].fillna(0) > 0)
+
+        return merged.groupby("booking_id").agg(
+            created_at=("created_at", "first"),
+            seats=("seat_id", "nunique"),
+            converted=("converted", "any"),
+            paid_at=("paid_at", "min"),
+            refunded=("refunded", "any"),
+            discounted=("discounted", "any")
+        )
+
+    def __funnel(self, bookings: pd.DataFrame, tickets: pd.DataFrame) -> dict:
+        holds = len(bookings)
+        paid = int(bookings["converted"].sum())
+
+        return {
+            "holds": holds,
+            "held_seats": int(bookings["seats"].sum()),
+            "paid_bookings": paid,
+            "tickets_paid": len(tickets),
+            "tickets_refunded": int(tickets["is_refunded"].sum()),
+            "refunded_bookings": int(bookings["refunded"].sum()),
+            "promotion_bookings": int(bookings["discounted"].sum()),
+            "conversion_rate": round(paid/holds, 4) if holds else 0
+        }
+
+    def __time_to_pay(self, bookings: pd.DataFrame) -> dict:
+        paid = bookings[bookings["converted"]]
+
+        if paid.empty:
+            return {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "histogram": {}}
+
+        seconds = (paid["paid_at"] - paid["created_at"]).dt.total_seconds()
+
+        quantiles = seconds.quantile([0.5, 0.9, 0.99])
+        histogram = (
+            pd.cut(seconds, bins=self.time_to_pay_bins, labels=self.time_to_pay_labels, right=False)
+            .value_counts(sort=False)
+        )
+
+        return {
+            "count": int(seconds.size),
+            "mean": round(float(seconds.mean()), 2),
+            "p50": round(float(quantiles[0.5]), 2),
+            "p90": round(float(quantiles[0.9]), 2),
+            "p99": round(float(quantiles[0.99]), 2),
+            "histogram": {str(label): int(count) for label, count in histogram.items()}
+        }
+
+    def __cohorts(self, bookings: pd.DataFrame) -> list[dict]:
+        if bookings.empty:
+            return []
+
+        cohort = bookings["created_at"].dt.floor("D")
+        sizes = cohort.value_counts().sort_index()
+        days_to_pay = (bookings["paid_at"].dt.floor("D") - cohort).dt.days
+        converted = days_to_pay.notna() & (days_to_pay < self.cohort_days)
+
+        curves = (
+            pd.crosstab(cohort[converted], days_to_pay[converted].astype(int))
+            .reindex(index=sizes.index, columns=range(self.cohort_days), fill_value=0)
+            .cumsum(axis=1)
+            .div(sizes, axis=0)
+            .round(4)
+        )
+
+        return [
+            {
+                "cohort": day.date(),
+                "holds": int(sizes[day]),
+                "conversion_by_day": curves.loc[day].tolist()
+            }
+            for day in sizes.index
+        ]
@@ -0,0 +1,82 @@
+from datetime import date
+from collections import defaultdict
+
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import F, Sum, Count
+from django.db.models.functions import TruncDate, Coalesce
+
+from vticket_app.models.user_ticket import UserTicket
+from vticket_app.models.daily_event_sales import DailyEventSales
+from vticket_app.services.statistic_service import StatisticService
+
+class SalesRollupService():
+    statistic_service = StatisticService()
+
+    def record_sales(self, tickets: list[UserTicket]):
+        """Add freshly paid tickets to their (event, ticket type, day) buckets. Call inside the sale's transaction."""
+        buckets = defaultdict(lambda: [0, 0])
+
+        for ticket in tickets:
+            if ticket.paid_at is None:
+                continue
+
+            key = (ticket.seat.ticket_type.event_id, ticket.seat.ticket_type_id, timezone.localtime(ticket.paid_at).date())
+            buckets[key][0] += 1
+            buckets[key][1] += ticket.paid_amount or 0
+
+        for (event_id, ticket_type_id, day), (count, revenue) in buckets.items():
+            self.__add_to_bucket(event_id, ticket_type_id, day, count, revenue)
+
+        event_ids = [event_id for event_id, _, _ in buckets.keys()]
+        transaction.on_commit(lambda: self.statistic_service.invalidate(event_ids))
+
+    def __add_to_bucket(self, event_id: int, ticket_type_id: int, day: date, tickets: int, revenue: int):
+        bucket, _ = DailyEventSales.objects.get_or_create(event_id=event_id, ticket_type_id=ticket_type_id, day=day)
+        DailyEventSales.objects.filter(id=bucket.id).update(
+            tickets=F("tickets") + tickets,
+            revenue=F("revenue") + revenue
+        )
+
+    def rebuild(self, event_id: int = None) -> int:
+        """Recompute the rollup from `user_ticket`, for one event or for everything."""
+        tickets = UserTicket.objects.filter(is_refunded=False, paid_at__isnull=False)
+        buckets = DailyEventSales.objects.all()
+
+        if event_id is not None:
+            tickets = tickets.filter(seat__ticket_type__event_id=event_id)
+            buckets = buckets.filter(event_id=event_id)
+
+        rows = (
+            tickets
+            .annotate(
+                day=TruncDate("paid_at"),
+                bucket_event_id=F("seat__ticket_type__event_id"),
+                bucket_ticket_type_id=F("seat__ticket_type_id")
+            )
+            .values("bucket_event_id", "bucket_ticket_type_id", "day")
+            .annotate(tickets=Count("id"), revenue=Coalesce(Sum("paid_amount"), 0))
+            .order_by()
+        )
+
+        event_ids = set(buckets.values_list("event_id", flat=True).distinct())
+
+        with transaction.atomic():
+            buckets.delete()
+            instances = DailyEventSales.objects.bulk_create(
+                [
+                    DailyEventSales(
+                        event_id=row["bucket_event_id"],
+                        ticket_type_id=row["bucket_ticket_type_id"],
+                        day=row["day"],
+                        tickets=row["tickets"],
+                        revenue=row["revenue"]
+                    )
+                    for row in rows.iterator()
+                ],
+                batch_size=1000
+            )
+            event_ids.update(instance.event_id for instance in instances)
+            transaction.on_commit(lambda: self.statistic_service.invalidate(list(event_ids)))
+
+        return len(instances)
@@ -0,0 +1,60 @@
+import datetime
+from collections import Counter
+
+from django.utils import timezone
+from django.core.cache import cache
+
+from vticket_app.models.seat_configuration import SeatConfiguration
+
+class SalesVelocityService():
+    __prefix_key = "sales_velocity"
+    sold_metric = "sold"
+    held_metric = "held"
+    retention_minutes = 24*60
+    default_minutes = 60
+    max_minutes = 24*60
+
+    def __minute(self, at: datetime.datetime = None) -> int:
+        return int((at or timezone.now()).timestamp() // 60)
+
+    def __key(self, event_id: int, metric: str, minute: int) -> str:
+        return f"{self.__prefix_key}:event:{event_id}:{metric}:{minute}"
+
+    def __record(self, seats: list[SeatConfiguration], metric: str):
+        try:
+            minute = self.__minute()
+
+            for event_id, count in Counter(seat.ticket_type.event_id for seat in seats).items():
+                key = self.__key(event_id, metric, minute)
+                cache.add(key, 0, self.retention_minutes*60)
+                cache.incr(key, count)
+        except Exception as e:
+            print(e)
+
+    def record_sales(self, seats: list[SeatConfiguration]):
+        self.__record(seats, self.sold_metric)
+
+    def record_holds(self, seats: list[SeatConfiguration]):
+        self.__record(seats, self.held_metric)
+
+    def get_velocity(self, event_id: int, minutes: int = None) -> list[dict]:
+        """Tickets sold and seats held per minute over the last `minutes` minutes, fetched with a single MGET."""
+        minutes = min(max(minutes or self.default_minutes, 1), self.max_minutes)
+        current = self.__minute()
+        window = range(current - minutes + 1, current + 1)
+
+        keys = [
+            self.__key(event_id, metric, minute)
+            for minute in window
+            for metric in (self.sold_metric, self.held_metric)
+        ]
+        values = cache.get_many(keys)
+
+        return [
+            {
+                "minute": datetime.datetime.fromtimestamp(minute*60, tz=datetime.timezone.utc),
+                "tickets_sold": int(values.get(self.__key(event_id, self.sold_metric, minute), 0)),
+                "seats_held": int(values.get(self.__key(event_id, self.held_metric, minute), 0))
+            }
+            for minute in window
+        ]
@@ -0,0 +1,120 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F, Q, Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from vticket_app.models.event import Event
+from vticket_app.models.ticket_type import TicketType
+from vticket_app.models.user_ticket import UserTicket
+from vticket_app.models.seat_configuration import SeatConfiguration
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
+
+class SeatCounterService():
+    """Maintains the total/sold/available seat counters of `TicketType`, rolled up to `Event`."""
+    cache_version_provider = CacheVersionProvider()
+
+    def add_seats(self, ticket_type: TicketType, count: int):
+        self.__apply({(ticket_type.id, ticket_type.event_id): count}, total=1, sold=0)
+
+    def record_sales(self, seats: list[SeatConfiguration]):
+        """Move freshly sold seats from available to sold. Call inside the sale's transaction."""
+        self.__apply(self.__group(seats), total=0, sold=1)
+
+    def record_refunds(self, seats: list[SeatConfiguration]):
+        """Give refunded seats back to available. Call inside the refund's transaction."""
+        self.__apply(self.__group(seats), total=0, sold=-1)
+
+    def __group(self, seats: list[SeatConfiguration]) -> Counter:
+        return Counter((seat.ticket_type_id, seat.ticket_type.event_id) for seat in seats)
+
+    def __apply(self, counts: dict, total: int, sold: int):
+        event_counts = Counter()
+
+        for (ticket_type_id, event_id), count in counts.items():
+            TicketType.objects.filter(id=ticket_type_id).update(**self.__increments(count, total, sold))
+            event_counts[event_id] += count
+
+        for event_id, count in event_counts.items():
+            Event.objects.filter(id=event_id).update(**self.__increments(count, total, sold))
+
+        transaction.on_commit(lambda: self.__invalidate(event_counts.keys()))
+
+    def __invalidate(self, event_ids):
+        for event_id in event_ids:
+            self.cache_version_provider.bump("event", event_id)
+
+        self.cache_version_provider.bump("event_catalog")
+
+    def __increments(self, count: int, total: int, sold: int) -> dict:
+        return {
+            "total_seats": F("total_seats") + count*total,
+            "sold_seats": F("sold_seats") + count*sold,
+            "available_seats": F("available_seats") + count*(total - sold)
+        }
+
+    def __expected_ticket_types(self):
+        sold = (
+            UserTicket.objects
+            .filter(seat__ticket_type_id=OuterRef("pk"), is_refunded=False)
+            .order_by()
+            .values("seat__ticket_type_id")
+            .annotate(count=Count("seat_id", distinct=True))
+            .values("count")
+        )
+
+        return (
+            TicketType.objects
+            .annotate(
+                expected_total=Count("seat_configurations"),
+                expected_sold=Coalesce(Subquery(sold), Value(0))
+            )
+        )
+
+    def check(self, fix: bool = False) -> list[dict]:
+        """
+        Compare every counter with a recount from `seat_configuration`/`user_ticket`.
+
+        Returns the mismatching ticket types and events; with `fix` the counters are overwritten
+        with the recounted values.
+        """
+        mismatches = []
+        ticket_types = self.__expected_ticket_types().filter(
+            ~Q(total_seats=F("expected_total"))
+            | ~Q(sold_seats=F("expected_sold"))
+            | ~Q(available_seats=F("expected_total") - F("expected_sold"))
+        )
+
+        for ticket_type in ticket_types:
+            mismatches.append({
+                "model": "ticket_type",
+                "id": ticket_type.id,
+                "counters": (ticket_type.total_seats, ticket_type.sold_seats, ticket_type.available_seats),
+                "expected": (ticket_type.expected_total, ticket_type.expected_sold, ticket_type.expected_total - ticket_type.expected_sold)
+            })
+
+        expected_events = {}
+
+        for ticket_type in self.__expected_ticket_types().values("event_id", "expected_total", "expected_sold"):
+            total, sold = expected_events.get(ticket_type["event_id"], (0, 0))
+            expected_events[ticket_type["event_id"]] = (total + ticket_type["expected_total"], sold + ticket_type["expected_sold"])
+
+        for event in Event.objects.only("id", "total_seats", "sold_seats", "available_seats"):
+            total, sold = expected_events.get(event.id, (0, 0))
+
+            if (event.total_seats, event.sold_seats, event.available_seats) != (total, sold, total - sold):
+                mismatches.append({
+                    "model": "event",
+                    "id": event.id,
+                    "counters": (event.total_seats, event.sold_seats, event.available_seats),
+                    "expected": (total, sold, total - sold)
+                })
+
+        if fix:
+            with transaction.atomic():
+                for mismatch in mismatches:
+                    model = TicketType if mismatch["model"] == "ticket_type" else Event
+                    total, sold, available = mismatch["expected"]
+                    model.objects.filter(id=mismatch["id"]).update(total_seats=total, sold_seats=sold, available_seats=available)
+
+        return mismatches
@@ -1,178 +1,171 @@
-from datetime import date, datetime, timedelta
-import json
-from django.forms import ValidationError
-import requests
-import time
-from vticket_app.configs.related_services import RelatedService
+from typing import Iterator
+
+from django.core.cache import cache
+
 from vticket_app.models.event import Event
-from vticket_app.models.user_ticket import UserTicket
-from django.db.models import Q, Case, When, Value, BooleanField, Sum, Count
+from vticket_app.models.ticket_type import TicketType
+from vticket_app.models.hourly_ticket_type_sales import HourlyTicketTypeSales
+from vticket_app.enums.export_format_enum import ExportFormatEnum
+from vticket_app.helpers.export_stream_provider import ExportStreamProvider
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
+from vticket_app.services.sales_aggregation_service import SalesAggregationService
+from vticket_app.services.event_leaderboard_service import EventLeaderboardService
 
 class StatisticService:
-    
-    def ticket_sold_and_revenue_by_event(self, event: Event, start_date: str, end_date: str) -> dict:
-
-        if start_date is not None:
-            try:
-                start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValidationError("start_date phải có định dạng YYYY-MM-DD")
-        if end_date is not None:
-            try:
-                end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValidationError("end_date phải có định dạng YYYY-MM-DD")
+    sales_aggregation_service = SalesAggregationService()
+    cache_version_provider = CacheVersionProvider()
+    event_leaderboard_service = EventLeaderboardService()
+    leaderboard_max_length = 100
+    cache_seconds = 24*60*60
+    export_header = ["date", "event_id", "event_name", "ticket_type_id", "ticket_type_name", "ticket_sold", "revenue"]
+
+    def ticket_sold_and_revenue_by_event(self, event: Event, start_date: str, end_date: str, granularity: str = None) -> dict:
+        start_date, end_date = self.sales_aggregation_service.resolve_date_range(start_date, end_date, event)
+        granularity = self.sales_aggregation_service.parse_granularity(granularity)
+        cache_key = self.__cache_key(event.id, start_date, end_date, granularity)
+        result = cache.get(cache_key)
+
+        if result is None:
+            statistic_data, total_ticket_sold, total_revenue = self.__build_statistic(start_date, end_date, granularity, event.id)
+
+            result = {
+                'id': event.id,
+                'name': event.name,
+                'statistic': statistic_data,
+                'total_ticket_sold': total_ticket_sold,
+                'total_revenue': total_revenue
+            }
+            cache.set(cache_key, result, self.cache_seconds)
+
+        return result
+
+    def total_ticket_sold_and_revenue(self, start_date: str, end_date: str, granularity: str = None) -> dict:
+        start_date, end_date = self.sales_aggregation_service.resolve_date_range(start_date, end_date)
+        granularity = self.sales_aggregation_service.parse_granularity(granularity)
+        cache_key = self.__cache_key(None, start_date, end_date, granularity)
+        result = cache.get(cache_key)
+
+        if result is None:
+            statistic_by_day, total_ticket_sold, total_revenue = self.__build_statistic(start_date, end_date, granularity)
+
+            result = {
+                'statistic_by_day': statistic_by_day,
+                'total_ticket_sold': total_ticket_sold,
+                'total_revenue': total_revenue
+            }
+            cache.set(cache_key, result, self.cache_seconds)
+
+        return result
+
+    def leaderboard(self, limit: int, upcoming: bool = False) -> list[dict]:
+        ranking = self.event_leaderboard_service.top(min(max(limit, 1), self.leaderboard_max_length), upcoming)
+        events = Event.objects.filter(id__in=[event_id for event_id, _ in ranking]).only("id", "name", "start_date").in_bulk()
+
+        return [
+            {
+                "id": event_id,
+                "name": events[event_id].name,
+                "start_date": events[event_id].start_date,
+                "ticket_sold": ticket_sold
+            }
+            for event_id, ticket_sold in ranking
+            if event_id in events
+        ]
+
+    def invalidate(self, event_ids: list[int]):
+        """Bump the statistic version of the given events (and of the platform totals) after their sales changed."""
+        for event_id in set(event_ids):
+            self.cache_version_provider.bump("statistic:event", event_id)
+
+        self.cache_version_provider.bump("statistic:all")
+
+    def __cache_key(self, event_id: int, start_date, end_date, granularity) -> str:
+        if event_id is None:
+            version = self.cache_version_provider.get("statistic:all")
+            return f"statistic:all:v{version}:{start_date}:{end_date}:{granularity}"
         
-        if start_date > end_date:
-            start_date, end_date = end_date, start_date
+        version = self.cache_version_provider.get("statistic:event", event_id)
+        return f"statistic:event:{event_id}:v{version}:{start_date}:{end_date}:{granularity}"
 
-        today = date.today()
-        if end_date > today:
-            end_date = today
-        
-        if end_date > event.start_date:
-            end_date = event.start_date - timedelta(days=1)
+    def export(self, start_date: str, end_date: str, granularity: str = None, export_format: str = None, event: Event = None) -> Iterator[str]:
+        start_date, end_date = self.sales_aggregation_service.resolve_date_range(start_date, end_date, event)
+        granularity = self.sales_aggregation_service.parse_granularity(granularity)
+        rows = self.sales_aggregation_service.export_rows(start_date, end_date, event.id if event else None, granularity)
+
+        if export_format == ExportFormatEnum.ndjson:
+            return ExportStreamProvider.ndjson(rows)
         
-        if end_date - start_date > timedelta(days=9):
-            start_date = end_date - timedelta(days=9)
+        return ExportStreamProvider.csv(rows, self.export_header)
+
+    def hourly_sales(self, event: Event, start_date: str, end_date: str) -> list[dict]:
+        start_date, end_date = self.sales_aggregation_service.resolve_date_range(start_date, end_date, event)
+
+        return list(
+            HourlyTicketTypeSales.objects
+            .filter(event_id=event.id, hour__date__range=(start_date, end_date))
+            .order_by("hour", "ticket_type_id")
+            .values("hour", "ticket_type_id", "tickets", "revenue")
+        )
+
+    def ticket_type_sales(self, event: Event) -> list[dict]:
+        """Sell-through of every ticket type of the event, the ones that sold out first coming first."""
+        ticket_types = {
+            ticket_type["id"]: {
+                "ticket_type_id": ticket_type["id"],
+                "name": ticket_type["name"],
+                "total_seats": ticket_type["total_seats"],
+                "ticket_sold": 0,
+                "revenue": 0,
+                "sold_out_at": None
+            }
+            for ticket_type in (
+                TicketType.objects
+                .filter(event_id=event.id)
+                .values("id", "name", "total_seats")
+            )
+        }
 
-        date_range = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+        rows = (
+            HourlyTicketTypeSales.objects
+            .filter(event_id=event.id)
+            .order_by("ticket_type_id", "hour")
+            .values("ticket_type_id", "hour", "tickets", "revenue")
+        )
 
-        event_id = event.id
-        event_name = event.name
+        for row in rows:
+            data = ticket_types.get(row["ticket_type_id"])
 
-        statistic_data = []
-        total_ticket_sold = 0
-        total_revenue = 0
-        for single_date in date_range:
-                
-            ticket_sold = UserTicket.objects.filter(
-                    seat__ticket_type__event_id=event_id,
-                    paid_at__date=single_date,
-                    is_refunded=False
-                ).count()
-            total_ticket_sold += ticket_sold
-            revenue = 0
-
-            if ticket_sold != 0:
-                user_tickets = UserTicket.objects.filter(
-                    seat__ticket_type__event_id=event_id,
-                    paid_at__date=single_date,
-                    is_refunded=False,
-                    payment_id__isnull=False
-                )
-  
-                payment_ids = user_tickets.values_list('payment_id', flat=True)
-                    
-                response = requests.post(
-                    url=f'{RelatedService.payment}/payment/list',
-                    headers={
-                        "Content-type": "application/json"
-                    },
-                    data=json.dumps(
-                        {
-                            "payment_ids": list(payment_ids)
-                        }
-                    )
-                )
-
-                resp_data = response.json()
-                total_amount = resp_data['data'].get('total_amount')
-                if total_amount is not None:
-                    revenue += total_amount
-                    total_revenue += total_amount  
-                
-            statistic_data.append({
-                'date': single_date,
-                'ticket_sold': ticket_sold,
-                'revenue': int(revenue/100)
-            })
-            
-        result = {
-            'id': event_id,
-            'name': event_name,
-            'statistic': statistic_data,
-            'total_ticket_sold': total_ticket_sold,
-            'total_revenue': int(total_revenue/100)
-        }
-        return result  
-    
-    def total_ticket_sold_and_revenue(self, start_date: str, end_date: str) -> dict:
-        if start_date is not None:
-            try:
-                start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValidationError("start_date phải có định dạng YYYY-MM-DD")
-        if end_date is not None:
-            try:
-                end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValidationError("end_date phải có định dạng YYYY-MM-DD")
-        
-        if start_date > end_date:
-            start_date, end_date = end_date, start_date
-
-        today = date.today()
-        if end_date > today:
-            end_date = today
+            if data is None:
+                continue
 
+            data["ticket_sold"] += row["tickets"]
+            data["revenue"] += row["revenue"]
 
-        if end_date - start_date > timedelta(days=9):
-            start_date = end_date - timedelta(days=9)
+            if data["sold_out_at"] is None and data["total_seats"] and data["ticket_sold"] >= data["total_seats"]:
+                data["sold_out_at"] = row["hour"]
 
-            
-        date_range = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+        return sorted(
+            ticket_types.values(),
+            key=lambda data: (
+                data["sold_out_at"] is None,
+                data["sold_out_at"] or 0,
+                -(data["ticket_sold"]/data["total_seats"] if data["total_seats"] else 0)
+            )
+        )
 
-        statistic_by_day = []
+    def __build_statistic(self, start_date, end_date, granularity, event_id: int = None) -> tuple[list, int, int]:
+        statistic_data = []
         total_ticket_sold = 0
         total_revenue = 0
-        for single_date in date_range:
-                
-            ticket_sold = UserTicket.objects.filter(
-                    paid_at__date=single_date,
-                    is_refunded=False
-                ).count()
-            
-            total_ticket_sold += ticket_sold
-            revenue = 0
-
-            if ticket_sold != 0:
-                user_tickets = UserTicket.objects.filter(
-                    paid_at__date=single_date,
-                    is_refunded=False,
-                    payment_id__isnull=False
-                )
-
-                payment_ids = user_tickets.values_list('payment_id', flat=True)
-                    
-                response = requests.post(
-                    url=f'{RelatedService.payment}/payment/list',
-                    headers={
-                        "Content-type": "application/json"
-                    },
-                    data=json.dumps(
-                        {
-                            "payment_ids": list(payment_ids)
-                        }
-                    )
-                )
-
-                resp_data = response.json()
-                total_amount = resp_data['data'].get('total_amount')
-                if total_amount is not None:
-                    revenue += total_amount
-                    total_revenue += total_amount  
-
-            statistic_by_day.append({
-                'date': single_date,
-                'ticket_sold': ticket_sold,
-                'revenue': int(revenue/100)
-            })
 
-        result = {
-            'statistic_by_day': statistic_by_day,
-            'total_ticket_sold': total_ticket_sold,
-            'total_revenue': int(total_revenue/100)
-        }
-        return result 
+        for row in self.sales_aggregation_service.sales_by_bucket(start_date, end_date, event_id, granularity):
+            total_ticket_sold += row["ticket_sold"]
+            total_revenue += row["revenue"]
+
+            statistic_data.append({
+                'date': row["day"],
+                'ticket_sold': row["ticket_sold"],
+                'revenue': row["revenue"]
+            })
 
+        return statistic_data, total_ticket_sold, total_revenue
@@ -1,15 +1,21 @@
+import gzip
 import json
 import pytz
+import struct
+import sys
 import requests
 import datetime
 import dataclasses
+from io import BytesIO
+from array import array
 from uuid import uuid4
 from typing import Tuple, Union
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from django.utils import timezone
 from django.db import transaction
 from django.core.cache import cache
-from django.forms import ValidationError
 from django.db.models import Q, Case, When, Value, BooleanField
 
 from vticket_app.configs.related_services import RelatedService
@@ -31,10 +37,29 @@ from vticket_app.dtos.seat_configuration_dto import SeatConfigurationDto
 
 from vticket_app.enums.instance_error_enum import InstanceErrorEnum
 from vticket_app.serializers.user_ticket_serializer import UserTicketSerializer
+from vticket_app.services.sales_aggregation_service import SalesAggregationService
+from vticket_app.services.sales_rollup_service import SalesRollupService
+from vticket_app.services.sales_velocity_service import SalesVelocityService
+from vticket_app.services.live_statistic_service import LiveStatisticService
+from vticket_app.services.event_leaderboard_service import EventLeaderboardService
+from vticket_app.services.seat_counter_service import SeatCounterService
+from vticket_app.helpers.cache_version_provider import CacheVersionProvider
 from vticket_app.tasks.queue_tasks import async_send_email
 
 class TicketService():
     booking_payment_minute = 15
+    gate_bundle_magic = b"VTGB"
+    gate_bundle_version = 1
+    gate_bundle_chunk_size = 5000
+    sales_aggregation_service = SalesAggregationService()
+    sales_rollup_service = SalesRollupService()
+    sales_velocity_service = SalesVelocityService()
+    live_statistic_service = LiveStatisticService()
+    event_leaderboard_service = EventLeaderboardService()
+    cache_version_provider = CacheVersionProvider()
+    seat_counter_service = SeatCounterService()
+    backfill_batch_size = 200
+    backfill_concurrency = 4
 
     def create_ticket_types(self, dataset: list[TicketTypeDto], event: Event) -> bool:
         try:
@@ -56,11 +81,16 @@ class TicketService():
                 if not result:
                     return False
                 
+            transaction.on_commit(lambda: self.__invalidate_event(event.id))
             return True
         except Exception as e:
             print(e)
             return False
         
+    def __invalidate_event(self, event_id: int):
+        self.cache_version_provider.bump("event", event_id)
+        self.cache_version_provider.bump("event_catalog")
+        
     def create_ticket_type_details(self, dataset: list[TicketTypeDetailDto], ticket_type: TicketType):
         try:
             instances = TicketTypeDetail.objects.bulk_create(
@@ -91,6 +121,7 @@ class TicketService():
                         )
                     )
             SeatConfiguration.objects.bulk_create(instances)
+            self.seat_counter_service.add_seats(ticket_type, len(instances))
             
             return all(bool(instance.id) for instance in instances)
         except Exception as e:
@@ -107,6 +138,11 @@ class TicketService():
 
             self._cache_booking(_booking_id, user_id, seats)
             self._save_booking(_booking_id, user_id, seats)
+            self.sales_velocity_service.record_holds(seats)
+            self.live_statistic_service.schedule_publish([seat.ticket_type.event_id for seat in seats])
+
+            for event_id in {seat.ticket_type.event_id for seat in seats}:
+                self.cache_version_provider.bump("event_seats", event_id)
 
             return InstanceErrorEnum.ALL_OK, _booking_id
         except Exception as e:
@@ -210,12 +246,7 @@ class TicketService():
                 _origin = _origin + _ticket_price
 
                 for fee in seat.ticket_type.ticket_type_details.all():
-                    _tax = 0
-
-                    if fee.fee_type == FeeTypeEnum.cash:
-                        _tax = fee.fee_value
-                    elif fee.fee_type == FeeTypeEnum.percent:
-                        _tax = _ticket_price*fee.fee_value/100
+                    _tax = self.__fee_value(fee, _ticket_price)
 
                     tax.append(
                         {
@@ -230,13 +261,7 @@ class TicketService():
                 if not self.__verify_promotion(bill_value, promotion):
                     return -1, None, CalculateBillErrorEnum.INVALID_PROMOTION
                 
-                _discount = {
-                    DiscountTypeEnum.cash: lambda v, p: p.discount_value,
-                    DiscountTypeEnum.percent: (lambda v, p: p.maximum_reduction_amount 
-                                               if v*p.discount_value/100 > p.maximum_reduction_amount 
-                                               else v*p.discount_value/100
-                                            )
-                }[promotion.discount_type](bill_value, promotion)
+                _discount = self.__discount_value(bill_value, promotion)
 
                 bill_value = bill_value - _discount
 
@@ -251,6 +276,51 @@ class TicketService():
             print(e)
             raise e
         
+    def __fee_value(self, fee: TicketTypeDetail, ticket_price: int) -> float:
+        if fee.fee_type == FeeTypeEnum.cash:
+            return fee.fee_value
+        elif fee.fee_type == FeeTypeEnum.percent:
+            return ticket_price*fee.fee_value/100
+        return 0
+    
+    def __discount_value(self, bill_value: float, promotion: Promotion) -> float:
+        return {
+            DiscountTypeEnum.cash: lambda v, p: p.discount_value,
+            DiscountTypeEnum.percent: (lambda v, p: p.maximum_reduction_amount 
+                                       if v*p.discount_value/100 > p.maximum_reduction_amount 
+                                       else v*p.discount_value/100
+                                    )
+        }[promotion.discount_type](bill_value, promotion)
+    
+    def ticket_type_charge(self, ticket_type: TicketType) -> float:
+        return ticket_type.price + sum(
+            self.__fee_value(fee, ticket_type.price) 
+            for fee in ticket_type.ticket_type_details.all()
+        )
+    
+    def get_booking_promotion(self, booking_id: str) -> Union[Promotion, None]:
+        keys = cache.keys(f"booking:{booking_id}:discount:*")
+
+        if not keys:
+            return None
+        
+        return Promotion.objects.filter(id=int(keys[0].split(":")[-1])).first()
+    
+    def calculate_ticket_amounts(self, seats: list[SeatConfiguration], promotion: Promotion = None) -> dict[int, Tuple[float, float]]:
+        """Split the bill of the given seats into (paid amount, discount) per seat, discount prorated by charge."""
+        charges = {seat.id: self.ticket_type_charge(seat.ticket_type) for seat in seats}
+        bill_value = sum(charges.values())
+
+        if promotion is None or bill_value == 0:
+            return {seat_id: (charge, 0) for seat_id, charge in charges.items()}
+        
+        _discount = min(self.__discount_value(bill_value, promotion), bill_value)
+
+        return {
+            seat_id: (charge - _discount*charge/bill_value, _discount*charge/bill_value)
+            for seat_id, charge in charges.items()
+        }
+        
     def __verify_promotion(self, total_bill: int, promotion: Promotion) -> bool:
         ok = {
             PromotionEvaluationConditionEnum.gt: lambda x: x > promotion.evaluation_value,
@@ -264,20 +334,33 @@ class TicketService():
     def update_booking(self, payment_id: int, booking_id: str, paid_at: datetime.datetime) -> bool:
         try:
             booking = Booking.objects.get(id=booking_id)
+            seats = list(booking.seats.select_related("ticket_type").prefetch_related("ticket_type__ticket_type_details"))
+            amounts = self.calculate_ticket_amounts(seats, self.get_booking_promotion(booking_id))
             tickets = []
 
-            for seat in booking.seats.all():
+            for seat in seats:
+                paid_amount, discount_amount = amounts[seat.id]
                 tickets.append(
                     UserTicket(
                         user_id=booking.user_id,
                         seat=seat,
                         is_refunded=False,
                         payment_id=payment_id,
-                        paid_at=paid_at
+                        paid_at=paid_at,
+                        paid_amount=round(paid_amount),
+                        discount_amount=round(discount_amount)
                     )
                 )
 
-            UserTicket.objects.bulk_create(tickets)
+            with transaction.atomic():
+                UserTicket.objects.bulk_create(tickets)
+                self.sales_rollup_service.record_sales(tickets)
+                self.seat_counter_service.record_sales(seats)
+
+            self.sales_velocity_service.record_sales(seats)
+            self.event_leaderboard_service.record_sales(seats)
+            self.live_statistic_service.schedule_publish([seat.ticket_type.event_id for seat in seats])
+
             return True
         except Exception as e:
             print(e)
@@ -331,45 +414,16 @@ class TicketService():
             print(e)
             return []
         
-    def get_tickets_sold_by_event_id(self, event_id: int, start_date: str, end_date: str) -> dict:
-        if start_date is not None:
-            try:
-                start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValidationError("start_date phải có định dạng YYYY-MM-DD")
-        if end_date is not None:
-            try:
-                end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValidationError("end_date phải có định dạng YYYY-MM-DD")
-        
-        if start_date > end_date:
-            start_date, end_date = end_date, start_date
-
-        today = datetime.date.today()
-        if end_date > today:
-            end_date = today
-        
+    def get_tickets_sold_by_event_id(self, event_id: int, start_date: str, end_date: str, granularity: str = None) -> dict:
         event = Event.objects.get(id=event_id)
-        if end_date > event.start_date:
-            end_date = event.start_date - datetime.timedelta(days=1)
-        
-        if end_date - start_date > datetime.timedelta(days=9):
-            start_date = end_date - datetime.timedelta(days=9)
-
-        date_range = [start_date + datetime.timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+        start_date, end_date = self.sales_aggregation_service.resolve_date_range(start_date, end_date, event)
+        granularity = self.sales_aggregation_service.parse_granularity(granularity)
 
         ticket_process_data = []
-        for single_date in date_range:
-            tickets_sold = UserTicket.objects.filter(
-                        seat__ticket_type__event_id=event_id,
-                        paid_at__date=single_date,
-                        is_refunded=False
-                    ).count()
-            
+        for row in self.sales_aggregation_service.sales_by_bucket(start_date, end_date, event_id, granularity):
             ticket_process_data.append({
-                'date': single_date,
-                'tickets_sold': tickets_sold
+                'date': row["day"],
+                'tickets_sold': row["ticket_sold"]
             })
 
         return ticket_process_data
@@ -411,4 +465,128 @@ class TicketService():
                 }
             )
         except Exception as e:
-            print(e)
\ No newline at end of file
+            print(e)
+
+    def build_gate_bundle(self, event: Event) -> bytes:
+        """
+        Pack every valid ticket id of the event into a compact bundle for offline gates.
+
+        Layout (little-endian): magic b"VTGB", uint8 version, uint32 event id, uint32 ticket count,
+        uint64 generated-at unix timestamp, followed by a gzip stream of the ticket ids as sorted
+        uint32 so devices can binary-search them.
+        """
+        ticket_ids = (
+            UserTicket.objects
+            .filter(
+                seat__ticket_type__event_id=event.id,
+                is_refunded=False,
+                payment_id__isnull=False
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=self.gate_bundle_chunk_size)
+        )
+
+        body = BytesIO()
+        count = 0
+
+        def _flush(gz: gzip.GzipFile, chunk: array) -> int:
+            if sys.byteorder != "little":
+                chunk.byteswap()
+            gz.write(chunk.tobytes())
+            return len(chunk)
+
+        with gzip.GzipFile(fileobj=body, mode="wb") as gz:
+            chunk = array("I")
+
+            for ticket_id in ticket_ids:
+                chunk.append(ticket_id)
+
+                if len(chunk) == self.gate_bundle_chunk_size:
+                    count += _flush(gz, chunk)
+                    chunk = array("I")
+
+            count += _flush(gz, chunk)
+
+        header = struct.pack(
+            "<4sBIIQ",
+            self.gate_bundle_magic,
+            self.gate_bundle_version,
+            event.id,
+            count,
+            int(timezone.now().timestamp())
+        )
+
+        return header + body.getvalue()
+
+    def get_payment_total_amount(self, payment_ids: list[int]) -> Union[float, None]:
+        try:
+            resp = requests.post(
+                url=f"{RelatedService.payment}/payment/list",
+                headers={
+                    "Content-type": "application/json"
+                },
+                data=json.dumps(
+                    {
+                        "payment_ids": list(payment_ids)
+                    }
+                )
+            )
+
+            total_amount = resp.json()["data"].get("total_amount")
+            return None if total_amount is None else total_amount/100
+        except Exception as e:
+            print(e)
+            return None
+
+    def backfill_paid_amounts(self, batch_size: int = None, concurrency: int = None) -> int:
+        """
+        Fill `paid_amount`/`discount_amount` of tickets sold before they were recorded locally.
+
+        Payments are fetched one by one from the payment service, at most `concurrency` at a time,
+        and each payment's total is split across its tickets by ticket type charge.
+        """
+        batch_size = batch_size or self.backfill_batch_size
+        payment_ids = list(
+            UserTicket.objects
+            .filter(paid_amount__isnull=True, payment_id__isnull=False)
+            .order_by("payment_id")
+            .values_list("payment_id", flat=True)
+            .distinct()
+        )
+        updated = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency or self.backfill_concurrency) as executor:
+            for i in range(0, len(payment_ids), batch_size):
+                batch = payment_ids[i:i + batch_size]
+                totals = executor.map(lambda payment_id: self.get_payment_total_amount([payment_id]), batch)
+                updated += self.__apply_payment_totals(
+                    {payment_id: total for payment_id, total in zip(batch, totals) if total is not None}
+                )
+
+        return updated
+
+    def __apply_payment_totals(self, totals: dict[int, float]) -> int:
+        tickets = list(
+            UserTicket.objects
+            .filter(payment_id__in=totals.keys(), paid_amount__isnull=True)
+            .select_related("seat__ticket_type")
+            .prefetch_related("seat__ticket_type__ticket_type_details")
+        )
+        tickets_by_payment = defaultdict(list)
+
+        for ticket in tickets:
+            tickets_by_payment[ticket.payment_id].append(ticket)
+
+        for payment_id, group in tickets_by_payment.items():
+            charges = {ticket.id: self.ticket_type_charge(ticket.seat.ticket_type) for ticket in group}
+            total_charge = sum(charges.values())
+
+            for ticket in group:
+                share = charges[ticket.id]/total_charge if total_charge else 1/len(group)
+                paid_amount = totals[payment_id]*share
+                ticket.paid_amount = round(paid_amount)
+                ticket.discount_amount = max(round(charges[ticket.id] - paid_amount), 0)
+
+        UserTicket.objects.bulk_update(tickets, ["paid_amount", "discount_amount"], batch_size=1000)
+        return len(tickets)
@@ -0,0 +1,7 @@
+from celery import shared_task
+
+from vticket_app.services.related_event_service import RelatedEventService
+
+@shared_task
+def recompute_related_events(event_id: int = None):
+    return RelatedEventService().recompute(event_id)
@@ -0,0 +1,7 @@
+from celery import shared_task
+
+from vticket_app.services.init_page_service import InitPageService
+
+@shared_task
+def refresh_home_page():
+    return InitPageService().refresh_home_payload() is not None
@@ -0,0 +1,21 @@
+from celery import shared_task
+from django.db import connection
+
+from vticket_app.services.event_leaderboard_service import EventLeaderboardService
+from vticket_app.services.live_statistic_service import LiveStatisticService
+
+@shared_task
+def refresh_hourly_ticket_type_sales():
+    with connection.cursor() as cursor:
+        cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY hourly_ticket_type_sales")
+
+    return True
+
+@shared_task
+def reconcile_event_leaderboard():
+    return EventLeaderboardService().reconcile()
+
+@shared_task
+def publish_live_statistic(event_ids: list[int]):
+    LiveStatisticService().publish(event_ids)
+    return True
@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Dates, times and datetimes are passed through to DRF's `JSONEncoder` so that they render
+    exactly as with `JSONRenderer`; orjson encodes UUIDs natively and the encoder handles
+    Decimals, querysets and the remaining DRF types.
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+
+        return orjson.dumps(data, default=self.encoder.default, option=self.options)
@@ -1,3 +1,4 @@
+from django.http import JsonResponse
 from rest_framework.response import Response
 
 from vticket_app.enums.rest_response_status_enum import RestResponseStatusEnum
@@ -33,6 +34,18 @@ class RestResponse():
             content_type=self.content_type
         )
     
+    @property
+    def json_response(self):
+        """Same envelope as `response`, for plain Django views running outside of DRF."""
+        return JsonResponse(
+            {
+                "data": self.__data,
+                "status": self.__status,
+                "message": self.__message,
+            },
+            json_dumps_params={"ensure_ascii": False}
+        )
+    
     def internal_server_error(self):
         self.__status = RestResponseStatusEnum.INTERNAL_SERVER_ERROR.value[0]
         self.__message = RestResponseStatusEnum.INTERNAL_SERVER_ERROR.value[1]
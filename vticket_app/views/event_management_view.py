@@ -1,10 +1,16 @@
+from django.http import HttpResponse
 from rest_framework import viewsets
 from rest_framework.request import Request
+from rest_framework.decorators import action
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 from django.db import transaction, IntegrityError
+from django.forms import ValidationError
 
 from vticket_app.dtos.create_event_dto import CreateEventDto
 from vticket_app.helpers.page_pagination import PagePagination
+from vticket_app.helpers.keyset_pagination import KeysetPagination
+from vticket_app.helpers.sparse_fieldset import SparseFieldset
 from vticket_app.models.event import Event
 from vticket_app.serializers.event_serializer import EventSerializer
 from vticket_app.utils.response import RestResponse
@@ -13,6 +19,7 @@ from vticket_app.decorators.validate_body import validate_body
 
 from vticket_app.services.event_service import EventService
 from vticket_app.services.promotion_service import PromotionService
+from vticket_app.services.ticket_service import TicketService
 
 from vticket_app.helpers.swagger_provider import SwaggerProvider
 from vticket_app.helpers.image_storage_providers.image_storage_provider import ImageStorageProvider
@@ -24,6 +31,7 @@ class EventManagementView(viewsets.GenericViewSet):
     image_storage_provider: ImageStorageProvider = FirebaseStorageProvider()
     event_service = EventService()
     promotion_service = PromotionService()
+    ticket_service = TicketService()
     permission_classes = (IsBusiness, )
     pagination_class = PagePagination
     serializer_class = EventSerializer
@@ -51,20 +59,53 @@ class EventManagementView(viewsets.GenericViewSet):
             return RestResponse().internal_server_error().response
         
 
-    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication()])
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
+                                            SwaggerProvider.query_param("cursor", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("with_total", openapi.TYPE_BOOLEAN),
+                                            SwaggerProvider.query_param("fields", openapi.TYPE_STRING)])
     def list(self, request: Request):
         try:
-            events = self.event_service.get_all_event(request.user.id)
+            fields = SparseFieldset.parse(request, EventSerializer, exclude=["ticket_types", "event_topic"])
+            events = SparseFieldset.only(self.event_service.get_all_event(request.user.id), fields, required=("start_date",))
+
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(descending=True)
+                pevents = paginator.paginate_queryset(events, request)
+                data = EventSerializer(pevents, many=True, fields=set(fields or ()), exclude=["ticket_types", "event_topic"]).data
+                return RestResponse().success().set_data(paginator.get_paginated_response(data)).response
             
             page_size = request.query_params.get('page_size')
             if page_size is None:
-                data = EventSerializer(events, many=True, exclude=["ticket_types", "event_topic"]).data
+                data = EventSerializer(events, many=True, fields=set(fields or ()), exclude=["ticket_types", "event_topic"]).data
                 return RestResponse().success().set_data(data).response
             
             pevents = self.paginate_queryset(events)
-            data = EventSerializer(pevents, many=True, exclude=["ticket_types", "event_topic"]).data
+            data = EventSerializer(pevents, many=True, fields=set(fields or ()), exclude=["ticket_types", "event_topic"]).data
             pdata = self.get_paginated_response(data)
             return RestResponse().success().set_data(pdata).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e) 
             return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=True, url_path="gate-bundle")
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication()])
+    def export_gate_bundle(self, request: Request, pk: str):
+        try:
+            event = self.event_service.get_event_by_id(int(pk))
+
+            if event is None:
+                return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
+            
+            if not self.event_service.can_export_gate_bundle(event, request.user):
+                return RestResponse().permission_denied().set_message("Bạn không có quyền xuất dữ liệu vé của sự kiện này!").response
+            
+            bundle = self.ticket_service.build_gate_bundle(event)
+
+            response = HttpResponse(bundle, content_type="application/octet-stream")
+            response["Content-Disposition"] = f'attachment; filename="event_{event.id}_gate_bundle.bin"'
+            return response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
@@ -3,13 +3,18 @@ from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.permissions import AllowAny
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from django.forms import ValidationError
 
 from vticket_app.helpers.swagger_provider import SwaggerProvider
+from vticket_app.helpers.event_query_plan import EventQueryPlan
+from vticket_app.helpers.sparse_fieldset import SparseFieldset
 from vticket_app.middlewares.custom_permissions.is_admin import IsAdmin
 from vticket_app.serializers.event_serializer import EventSerializer
 from vticket_app.services.event_service import EventService
 from vticket_app.utils.response import RestResponse
 from vticket_app.decorators.validate_body import validate_body
+from vticket_app.decorators.conditional_get import conditional_get
 from vticket_app.services.event_topic_service import EventTopicService
 from vticket_app.serializers.event_topic_serializer import EventTopicSerializer
 from vticket_app.validations.event_topic_validator import EventTopicValidator
@@ -23,6 +28,7 @@ class EventTopicView(viewsets.ViewSet):
         return [] if self.action in ["list"] else super().get_permissions()
     
     @action(methods=["GET"], detail=True, url_path="events", permission_classes=(), authentication_classes=())
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("fields", openapi.TYPE_STRING)])
     def get_events_by_topic(self, request: Request, pk: int):
         try:
             validate = EventTopicValidator(data={"event_topic": pk})
@@ -30,9 +36,16 @@ class EventTopicView(viewsets.ViewSet):
             if not validate.is_valid():
                 return RestResponse().validation_failed().set_data(validate.errors).response
             
-            events = self.event_service.get_events_by_topic(validate.validated_data["event_topic"])
+            fields = SparseFieldset.parse(request, EventSerializer, exclude=["ticket_types"])
+            events = EventQueryPlan.apply(
+                SparseFieldset.only(self.event_service.get_events_by_topic(validate.validated_data["event_topic"]), fields),
+                fields=fields,
+                exclude=["ticket_types"]
+            )
             
-            return RestResponse().success().set_data(EventSerializer(events, many=True, exclude=["ticket_types"]).data).response
+            return RestResponse().success().set_data(EventSerializer(events, many=True, fields=set(fields or ()), exclude=["ticket_types"]).data).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e)
             return RestResponse().internal_server_error().response
@@ -52,6 +65,7 @@ class EventTopicView(viewsets.ViewSet):
             return RestResponse().internal_server_error().response
     
     @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication()])
+    @conditional_get(lambda self, request: [self.event_topic_service.get_version()])
     def list(self, request: Request):
         try:
             data = self.event_topic_service.get_all_topics()
@@ -3,13 +3,20 @@ from rest_framework.request import Request
 from rest_framework.decorators import action
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from django.forms import ValidationError
+from django.utils import timezone
 
 from vticket_app.models.event import Event
 from vticket_app.helpers.page_pagination import PagePagination
+from vticket_app.helpers.keyset_pagination import KeysetPagination
+from vticket_app.helpers.sparse_fieldset import SparseFieldset
+from vticket_app.helpers.event_query_plan import EventQueryPlan
 from vticket_app.serializers.event_serializer import EventSerializer
+from vticket_app.serializers.promotion_serializer import PromotionSerializer
 from vticket_app.services.feedback_service import FeedbackService
 from vticket_app.services.ticket_service import TicketService
 from vticket_app.utils.response import RestResponse
+from vticket_app.decorators.conditional_get import conditional_get
 
 from vticket_app.services.event_service import EventService
 from vticket_app.services.promotion_service import PromotionService
@@ -29,45 +36,83 @@ class EventView(viewsets.GenericViewSet):
     ticket_service = TicketService()
     authentication_classes = ()
 
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("fields", openapi.TYPE_STRING)])
+    @conditional_get(lambda self, request, pk: self.event_service.get_event_detail_versions(int(pk)))
     def retrieve(self, request: Request, pk: int):
         try:
-            event = self.event_service.get_event_by_id(int(pk))
+            fields = SparseFieldset.parse(request, EventSerializer)
+            payload = self.event_service.get_event_detail_payload(int(pk), fields)
 
-            if event is None:
+            if payload is None:
                 return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
-            
-            related_events = self.event_service.get_related_events(event)
-
-            return RestResponse().success().set_data(
-                {
-                    "event": EventSerializer(event).data,
-                    "related_events": EventSerializer(related_events, many=True, exclude=["ticket_types"]).data,
-                    "org_info": self.event_service.get_owner_info(event)
-                }
-            ).response
+
+            return RestResponse().success().set_data(payload).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e) 
             return RestResponse().internal_server_error().response
 
     @action(methods=["GET"], detail=True, url_path="promotion")
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("fields", openapi.TYPE_STRING)])
     def get_promotions(self, request: Request, pk: str):
         try:
-            result = self.promotion_service.get_promotions_by_event_id(int(pk))
+            fields = SparseFieldset.parse(request, PromotionSerializer)
+            result = self.promotion_service.get_promotions_by_event_id(int(pk), fields)
             return RestResponse().success().set_data({"promotions": result}).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e)
             return RestResponse().internal_server_error().response
         
     @action(methods=["GET"], detail=False, url_path="search", pagination_class=PagePagination)
-    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("kw", openapi.TYPE_STRING)])
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("kw", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("order_by", openapi.TYPE_STRING, "popularity | availability"),
+                                            SwaggerProvider.query_param("available", openapi.TYPE_BOOLEAN),
+                                            SwaggerProvider.query_param("cursor", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("with_total", openapi.TYPE_BOOLEAN),
+                                            SwaggerProvider.query_param("fields", openapi.TYPE_STRING)])
+    @conditional_get(lambda self, request: [self.event_service.get_catalog_version()])
     def search(self, request: Request):
         try:
             keyword = request.query_params.get("kw", None) 
-            events = self.event_service.search_event(keyword=keyword)
+            order_by = request.query_params.get("order_by", None)
+            available_only = request.query_params.get("available", "false").lower() == "true"
+            fields = SparseFieldset.parse(request, EventSerializer, exclude=["ticket_types"])
+            events = self.event_service.search_event(keyword=keyword, order_by=order_by, available_only=available_only)
+            required = self.event_service.get_search_keyset_fields(keyword, order_by)
+            events = EventQueryPlan.apply(SparseFieldset.only(events, fields, required=required), fields=fields, exclude=["ticket_types"])
+
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(descending=True, fields=self.event_service.get_search_keyset_fields(keyword, order_by))
+                pevents = paginator.paginate_queryset(events, request)
+                data = EventSerializer(pevents, many=True, fields=set(fields or ()), exclude=["ticket_types"]).data
+                return RestResponse().success().set_data(paginator.get_paginated_response(data)).response
+
             pevents = self.paginate_queryset(events)
-            data = EventSerializer(pevents, many=True, exclude=["ticket_types"]).data
+            data = EventSerializer(pevents, many=True, fields=set(fields or ()), exclude=["ticket_types"]).data
             pdata = self.get_paginated_response(data)
             return RestResponse().success().set_data(pdata).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+        
+    @action(methods=["GET"], detail=False, url_path="suggest")
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("kw", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("limit", openapi.TYPE_INTEGER)])
+    def suggest(self, request: Request):
+        try:
+            keyword = request.query_params.get("kw", None)
+
+            try:
+                limit = min(max(int(request.query_params.get("limit", 10)), 1), 20)
+            except ValueError:
+                return RestResponse().validation_failed().set_message("limit phải là số nguyên").response
+
+            return RestResponse().success().set_data(self.event_service.suggest(keyword, limit)).response
         except Exception as e:
             print(e)
             return RestResponse().internal_server_error().response
@@ -82,36 +127,70 @@ class EventView(viewsets.GenericViewSet):
             return RestResponse().internal_server_error().response
         
     @action(methods=["GET"], detail=True, url_path="feedback")
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("cursor", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("page_size", openapi.TYPE_INTEGER)])
     def get_feedbacks(self, request: Request, pk: str):
         try:
+            rating = self.feedback_service.get_rating(int(pk))
+
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(descending=True, fields=("submited_at", "id"))
+                feedbacks = paginator.paginate_queryset(self.feedback_service.get_feedback_queryset(int(pk)), request)
+                data = paginator.get_paginated_response(self.feedback_service.serialize_feedbacks(feedbacks))
+                return RestResponse().success().set_data({"feedbacks": data, "rating": rating}).response
+
             result = self.feedback_service.get_feedbacks_by_event_id(int(pk))
-            return RestResponse().success().set_data({"feedbacks": result}).response
+            return RestResponse().success().set_data({"feedbacks": result, "rating": rating}).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e)
             return RestResponse().internal_server_error().response
     
     @action(methods=["GET"], detail=False, url_path="upcomming", pagination_class=PagePagination)
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("order_by", openapi.TYPE_STRING, "popularity | availability"),
+                                            SwaggerProvider.query_param("available", openapi.TYPE_BOOLEAN),
+                                            SwaggerProvider.query_param("cursor", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("with_total", openapi.TYPE_BOOLEAN),
+                                            SwaggerProvider.query_param("fields", openapi.TYPE_STRING)])
+    @conditional_get(lambda self, request: [self.event_service.get_catalog_version(), timezone.now().date()])
     def get_upcomming_events(self, request: Request):
         try:
-            events = self.event_service.get_upcomming_events()
+            order_by = request.query_params.get("order_by", None)
+            available_only = request.query_params.get("available", "false").lower() == "true"
+            fields = SparseFieldset.parse(request, EventSerializer, exclude=["ticket_types", "event_topic"])
+            events = self.event_service.get_upcomming_events(order_by=order_by, available_only=available_only)
+            events = SparseFieldset.only(events, fields, required=self.event_service.get_upcomming_keyset_fields(order_by))
+
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(descending=order_by is not None, fields=self.event_service.get_upcomming_keyset_fields(order_by))
+                pevents = paginator.paginate_queryset(events, request)
+                data = EventSerializer(pevents, many=True, fields=set(fields or ()), exclude=["ticket_types", "event_topic"]).data
+                return RestResponse().success().set_data(paginator.get_paginated_response(data)).response
      
             pevents = self.paginate_queryset(events)
-            data = EventSerializer(pevents, many=True, exclude=["ticket_types", "event_topic"]).data
+            data = EventSerializer(pevents, many=True, fields=set(fields or ()), exclude=["ticket_types", "event_topic"]).data
             pdata = self.get_paginated_response(data)
             return RestResponse().success().set_data(pdata).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e) 
             return RestResponse().internal_server_error().response
         
     @action(methods=["GET"], detail=True, url_path="tickets-sold")
     @swagger_auto_schema(manual_parameters=[SwaggerProvider.query_param("start_date", openapi.TYPE_STRING),
-                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING)])
+                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("granularity", openapi.TYPE_STRING, "day | week | month")])
     def get_tickets_sold(self, request: Request, pk: str):
         try:
             start_date = request.query_params.get("start_date", None) 
             end_date = request.query_params.get("end_date", None)
-            result = self.ticket_service.get_tickets_sold_by_event_id(int(pk), start_date=start_date, end_date=end_date)
+            granularity = request.query_params.get("granularity", None)
+            result = self.ticket_service.get_tickets_sold_by_event_id(int(pk), start_date=start_date, end_date=end_date, granularity=granularity)
             return RestResponse().success().set_data(result).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e)
             return RestResponse().internal_server_error().response
\ No newline at end of file
@@ -4,6 +4,7 @@ from rest_framework.decorators import action
 from drf_yasg.utils import swagger_auto_schema
 
 from vticket_app.utils.response import RestResponse
+from vticket_app.decorators.conditional_get import conditional_get
 from vticket_app.services.init_page_service import InitPageService
 
 class InitPageView(viewsets.ViewSet):
@@ -12,21 +13,10 @@ class InitPageView(viewsets.ViewSet):
     init_page_service = InitPageService()
 
     @action(methods=["GET"], detail=False, url_path="home")
+    @conditional_get(lambda self, request: self.init_page_service.get_home_versions())
     def home(self, request: Request):
         try:
-            banners = self.init_page_service.get_banner()
-            topic_types = self.init_page_service.get_topic_types()
-            upcomming_events = self.init_page_service.get_upcomming_events()
-            outstanding_events = self.init_page_service.get_outstanding_events()      
-             
-            return RestResponse().success().set_data(
-                {
-                    "banners": banners,
-                    "outstanding_events": outstanding_events,
-                    "upcoming_events": upcomming_events,
-                    "topic_types": topic_types
-                }
-            ).response
+            return RestResponse().success().set_data(self.init_page_service.get_home_payload()).response
         except Exception as e:
             print(e)
             return RestResponse().internal_server_error().response
\ No newline at end of file
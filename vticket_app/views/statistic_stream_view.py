@@ -0,0 +1,40 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, StreamingHttpResponse
+from rest_framework.exceptions import APIException
+
+from vticket_app.enums.role_enum import RoleEnum
+from vticket_app.utils.response import RestResponse
+from vticket_app.services.event_service import EventService
+from vticket_app.services.live_statistic_service import LiveStatisticService
+from vticket_app.middlewares.custom_jwt_authentication import CustomJWTAuthentication
+
+event_service = EventService()
+live_statistic_service = LiveStatisticService()
+authentication = CustomJWTAuthentication()
+
+async def stream_event_statistic(request: HttpRequest, pk: int):
+    """Server-sent events with the live totals of an event, for its owner's dashboard. Needs the ASGI app."""
+    try:
+        user, _ = await sync_to_async(authentication.authenticate)(request)
+    except APIException:
+        return RestResponse().invalid_token().json_response
+
+    try:
+        if user.role != RoleEnum.BUSINESS:
+            return RestResponse().permission_denied().json_response
+
+        event = await sync_to_async(event_service.get_event_by_id)(pk)
+
+        if event is None:
+            return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").json_response
+
+        if not event_service.can_view_statistic(event, user):
+            return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").json_response
+
+        response = StreamingHttpResponse(live_statistic_service.stream(event.id), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+    except Exception as e:
+        print(e)
+        return RestResponse().internal_server_error().json_response
@@ -1,3 +1,5 @@
+from django.forms import ValidationError
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
 from rest_framework.request import Request
 from drf_yasg.utils import swagger_auto_schema
@@ -6,8 +8,11 @@ from drf_yasg import openapi
 
 from vticket_app.services.statistic_service import StatisticService
 from vticket_app.services.event_service import EventService
+from vticket_app.services.sales_analytics_service import SalesAnalyticsService
+from vticket_app.services.sales_velocity_service import SalesVelocityService
 from vticket_app.serializers.event_statistic_serializer import EventStatisticSerialize
 from vticket_app.serializers.statistic_serializer import StatisticSerializer
+from vticket_app.enums.export_format_enum import ExportFormatEnum
 
 from vticket_app.middlewares.custom_permissions.is_business import IsBusiness
 from vticket_app.middlewares.custom_permissions.is_admin import IsAdmin
@@ -18,41 +23,211 @@ from vticket_app.helpers.swagger_provider import SwaggerProvider
 class StatisticView(viewsets.ViewSet):
     statistic_service = StatisticService()
     event_service = EventService()
+    sales_analytics_service = SalesAnalyticsService()
+    sales_velocity_service = SalesVelocityService()
 
     @action(methods=["GET"], detail=True, url_path="event", permission_classes=(IsBusiness,))
     @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
                                             SwaggerProvider.query_param("start_date", openapi.TYPE_STRING),
-                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING)])
+                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("granularity", openapi.TYPE_STRING, "day | week | month")])
     def get_ticket_sold_and_revenue_by_event(self, request: Request, pk: str):
         try:
             event = self.event_service.get_event_by_id(int(pk))
             if event is None:
                 return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
-            
+
             if not self.event_service.can_view_statistic(event, request.user):
                 return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").response
-            
-            start_date = request.query_params.get("start_date", None) 
+
+            start_date = request.query_params.get("start_date", None)
             end_date = request.query_params.get("end_date", None)
-            data = self.statistic_service.ticket_sold_and_revenue_by_event(event, start_date=start_date, end_date=end_date)
-            
+            granularity = request.query_params.get("granularity", None)
+            data = self.statistic_service.ticket_sold_and_revenue_by_event(event, start_date=start_date, end_date=end_date, granularity=granularity)
+
             return RestResponse().success().set_data(EventStatisticSerialize(data).data).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
         except Exception as e:
             print(e)
-            return RestResponse().internal_server_error().response  
-        
+            return RestResponse().internal_server_error().response
+
 
     @action(methods=["GET"], detail=False, url_path="admin", permission_classes=(IsAdmin,))
     @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
                                             SwaggerProvider.query_param("start_date", openapi.TYPE_STRING),
-                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING)])
+                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("granularity", openapi.TYPE_STRING, "day | week | month")])
     def get_total_ticket_sold_and_revenue(self, request: Request):
         try:
-            start_date = request.query_params.get("start_date", None) 
+            start_date = request.query_params.get("start_date", None)
             end_date = request.query_params.get("end_date", None)
-            data = self.statistic_service.total_ticket_sold_and_revenue(start_date=start_date, end_date=end_date)
-            
+            granularity = request.query_params.get("granularity", None)
+            data = self.statistic_service.total_ticket_sold_and_revenue(start_date=start_date, end_date=end_date, granularity=granularity)
+
             return RestResponse().success().set_data(StatisticSerializer(data).data).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=True, url_path="event/export", permission_classes=(IsBusiness,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
+                                            SwaggerProvider.query_param("start_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("granularity", openapi.TYPE_STRING, "day | week | month"),
+                                            SwaggerProvider.query_param("export_format", openapi.TYPE_STRING, "csv | ndjson")])
+    def export_ticket_sold_and_revenue_by_event(self, request: Request, pk: str):
+        try:
+            event = self.event_service.get_event_by_id(int(pk))
+            if event is None:
+                return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
+
+            if not self.event_service.can_view_statistic(event, request.user):
+                return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").response
+
+            return self.__export(request, f"event_{event.id}_statistic", event)
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=False, url_path="admin/export", permission_classes=(IsAdmin,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
+                                            SwaggerProvider.query_param("start_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("granularity", openapi.TYPE_STRING, "day | week | month"),
+                                            SwaggerProvider.query_param("export_format", openapi.TYPE_STRING, "csv | ndjson")])
+    def export_total_ticket_sold_and_revenue(self, request: Request):
+        try:
+            return self.__export(request, "statistic")
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=True, url_path="event/hourly", permission_classes=(IsBusiness,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
+                                            SwaggerProvider.query_param("start_date", openapi.TYPE_STRING),
+                                            SwaggerProvider.query_param("end_date", openapi.TYPE_STRING)])
+    def get_hourly_sales_by_event(self, request: Request, pk: str):
+        try:
+            event = self.event_service.get_event_by_id(int(pk))
+            if event is None:
+                return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
+
+            if not self.event_service.can_view_statistic(event, request.user):
+                return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").response
+
+            start_date = request.query_params.get("start_date", None)
+            end_date = request.query_params.get("end_date", None)
+            data = self.statistic_service.hourly_sales(event, start_date=start_date, end_date=end_date)
+
+            return RestResponse().success().set_data(data).response
+        except ValidationError as e:
+            return RestResponse().validation_failed().set_message(e.messages[0]).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=True, url_path="event/ticket-type", permission_classes=(IsBusiness,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication()])
+    def get_ticket_type_sales_by_event(self, request: Request, pk: str):
+        try:
+            event = self.event_service.get_event_by_id(int(pk))
+            if event is None:
+                return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
+
+            if not self.event_service.can_view_statistic(event, request.user):
+                return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").response
+
+            return RestResponse().success().set_data(self.statistic_service.ticket_type_sales(event)).response
         except Exception as e:
             print(e)
-            return RestResponse().internal_server_error().response  
\ No newline at end of file
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=True, url_path="event/funnel", permission_classes=(IsBusiness,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication()])
+    def get_sales_funnel_by_event(self, request: Request, pk: str):
+        try:
+            event = self.event_service.get_event_by_id(int(pk))
+            if event is None:
+                return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
+
+            if not self.event_service.can_view_statistic(event, request.user):
+                return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").response
+
+            return RestResponse().success().set_data(self.sales_analytics_service.funnel(event)).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=True, url_path="event/velocity", permission_classes=(IsBusiness,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
+                                            SwaggerProvider.query_param("minutes", openapi.TYPE_INTEGER)])
+    def get_sales_velocity_by_event(self, request: Request, pk: str):
+        try:
+            event = self.event_service.get_event_by_id(int(pk))
+            if event is None:
+                return RestResponse().defined_error().set_message("Sự kiện không tồn tại!").response
+
+            if not self.event_service.can_view_statistic(event, request.user):
+                return RestResponse().permission_denied().set_message("Bạn không có quyền xem thông kê của sự kiện này!").response
+
+            minutes = request.query_params.get("minutes", None)
+
+            try:
+                minutes = int(minutes) if minutes else None
+            except ValueError:
+                return RestResponse().validation_failed().set_message("minutes phải là số nguyên").response
+
+            data = self.sales_velocity_service.get_velocity(event.id, minutes)
+
+            return RestResponse().success().set_data(data).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    @action(methods=["GET"], detail=False, url_path="leaderboard", permission_classes=(IsAdmin,))
+    @swagger_auto_schema(manual_parameters=[SwaggerProvider.header_authentication(),
+                                            SwaggerProvider.query_param("limit", openapi.TYPE_INTEGER),
+                                            SwaggerProvider.query_param("upcoming", openapi.TYPE_BOOLEAN)])
+    def get_event_leaderboard(self, request: Request):
+        try:
+            try:
+                limit = int(request.query_params.get("limit", 20))
+            except ValueError:
+                return RestResponse().validation_failed().set_message("limit phải là số nguyên").response
+
+            upcoming = request.query_params.get("upcoming", "false").lower() == "true"
+            data = self.statistic_service.leaderboard(limit, upcoming)
+
+            return RestResponse().success().set_data(data).response
+        except Exception as e:
+            print(e)
+            return RestResponse().internal_server_error().response
+
+    def __export(self, request: Request, filename: str, event=None) -> StreamingHttpResponse:
+        export_format = request.query_params.get("export_format", ExportFormatEnum.csv)
+
+        if export_format not in ExportFormatEnum.values:
+            raise ValidationError(f"export_format phải là một trong {', '.join(ExportFormatEnum.values)}")
+
+        content = self.statistic_service.export(
+            start_date=request.query_params.get("start_date", None),
+            end_date=request.query_params.get("end_date", None),
+            granularity=request.query_params.get("granularity", None),
+            export_format=export_format,
+            event=event
+        )
+        content_type = {
+            ExportFormatEnum.csv: "text/csv; charset=utf-8",
+            ExportFormatEnum.ndjson: "application/x-ndjson"
+        }[ExportFormatEnum(export_format)]
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+        return response